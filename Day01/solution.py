@@ -1,8 +1,11 @@
 """
 Solution for Day 1
 """
-import bisect
-import time
+import heapq
+import itertools
+import os
+
+import numpy as np
 
 from lib.base_solver import BaseSolver
 
@@ -12,7 +15,7 @@ class Solver(BaseSolver):
     Main Solver Class
     """
 
-    __slots__ = ["_perf", "_lists", "_counts"]
+    __slots__ = ["_lists", "_counts"]
 
     def __init__(self, inp: str):
         """
@@ -21,17 +24,12 @@ class Solver(BaseSolver):
         Args:
              inp (str): Path for input file
         """
-        t0 = time.perf_counter()
-
         super().__init__(inp=inp)
 
-        self._perf = {}
-        self._counts = {}
+        self._counts = None
 
         self._lists = None  # init as None for cache checking
 
-        self._perf["init"] = time.perf_counter() - t0
-
     @property
     def lists(self) -> dict:
         """
@@ -40,56 +38,45 @@ class Solver(BaseSolver):
         Uses a local cache for repeated calls
 
         Returns:
-             dict: {"l": [list], "r": [list]}
+             dict: {"l": np.ndarray, "r": np.ndarray}
         """
-        t0 = time.perf_counter()
-
         if self._lists is not None:
             return self._lists
 
-        rows = self.data.split("\n")
+        with self.phase("list_get"):
+            arrays = self.cached("lists", 2, self._build_lists)
 
-        lists = {
-            "l": [],
-            "r": [],
-        }
-        for row in rows:
-            # rows are double spaced integers
-            # e.g 10001  10002
-            # integers are always 5 figure, but it feels
-            # better to generalise to any length
+            self._lists = {"l": arrays["l"], "r": arrays["r"]}
+            # distinct values of the right list (sorted), and how often each occurs
+            self._counts = (arrays["count_keys"], arrays["count_values"])
 
-            int_l, int_r = [int(item) for item in row.strip().split(" ") if item != ""]
+        return self._lists
 
-            id_l = bisect.bisect(lists["l"], int_l)
-            lists["l"].insert(id_l, int_l)
+    def _build_lists(self) -> dict:
+        """Parse and sort the two lists, returned as arrays for caching"""
+        # rows are double spaced integers
+        # e.g 10001  10002
+        # so the whole file is one whitespace separated run of integers
+        # integers are always 5 figure, but this works for any length
+        values = np.fromstring(self.data, dtype=np.int64, sep=" ").reshape(-1, 2)
 
-            id_r = bisect.bisect(lists["r"], int_r)
-            lists["r"].insert(id_r, int_r)
+        l = np.sort(values[:, 0])
+        r = np.sort(values[:, 1])
+        count_keys, count_values = np.unique(r, return_counts=True)
 
-            try:
-                self._counts[int_r] += 1
-            except KeyError:
-                self._counts[int_r] = 1
-
-        # cache the data
-        self._lists = lists
-
-        self._perf["list_get"] = time.perf_counter() - t0
-        return lists
+        return {
+            "l": l,
+            "r": r,
+            "count_keys": count_keys,
+            "count_values": count_values.astype(np.int64),
+        }
 
     def run_part_1(self) -> int:
         """Run the solution"""
-        t0 = time.perf_counter()
-        result = 0
-
         list_l = self.lists["l"]
         list_r = self.lists["r"]
-        for a, b in zip(list_l, list_r):
-            result += abs(a - b)
 
-        self._perf["run 1"] = time.perf_counter() - t0
-        return result
+        return int(np.abs(list_l - list_r).sum())
 
     def run_part_2(self) -> int:
         """
@@ -98,23 +85,137 @@ class Solver(BaseSolver):
         Returns:
             int
         """
-        t0 = time.perf_counter()
+        list_l = self.lists["l"]
+        keys, values = self._counts
+        if len(keys) == 0:
+            return 0
+
+        # look up each left value amongst the distinct right values
+        idx = np.searchsorted(keys, list_l)
+        idx[idx == len(keys)] = 0
+        counts = np.where(keys[idx] == list_l, values[idx], 0)
+
+        return int(np.dot(counts, list_l))
+
+
+def read_chunks(inp: str, chunk_size: int):
+    """
+    Read a two column file in pieces of about chunk_size bytes
+
+    Chunks are cut at the last newline, so no row is split
+
+    Yields:
+        np.ndarray: (N, 2) int64 rows of the chunk
+    """
+    tail = b""
+    with open(inp, "rb") as o:
+        while True:
+            block = o.read(chunk_size)
+            if not block:
+                break
+            block = tail + block
+            cut = block.rfind(b"\n") + 1
+            block, tail = block[:cut], block[cut:]
+            if block:
+                yield np.fromstring(block.decode(), dtype=np.int64, sep=" ").reshape(-1, 2)
+
+    if tail.strip():
+        yield np.fromstring(tail.decode(), dtype=np.int64, sep=" ").reshape(-1, 2)
+
+
+def write_runs(inp: str, directory: str, chunk_size: int) -> tuple[list[np.memmap], list[np.memmap]]:
+    """
+    Sort each chunk of the input and write its columns to memory mapped files
+
+    Returns:
+        tuple: (left runs, right runs), read only int64 memmaps
+    """
+    runs = ([], [])
+    for idx, chunk in enumerate(read_chunks(inp, chunk_size)):
+        for col, side in enumerate(("l", "r")):
+            path = os.path.join(directory, f"{side}-{idx}.bin")
+            run = np.memmap(path, dtype=np.int64, mode="w+", shape=(len(chunk),))
+            run[:] = np.sort(chunk[:, col])
+            run.flush()
+            del run
+            runs[col].append(np.memmap(path, dtype=np.int64, mode="r", shape=(len(chunk),)))
+    return runs
+
+
+def iter_run(run: np.memmap, block: int):
+    """Iterate a sorted run, paging it in block elements at a time"""
+    for start in range(0, len(run), block):
+        yield from run[start:start + block].tolist()
+
+
+def merged(runs: list[np.memmap], block: int):
+    """k-way merge of sorted runs"""
+    return heapq.merge(*(iter_run(run, block) for run in runs))
+
+
+def counted(stream):
+    """Collapse a sorted stream into (value, count) pairs"""
+    for value, group in itertools.groupby(stream):
+        yield value, sum(1 for _ in group)
+
+
+def solve_streaming(inp: str, chunk_size: int = 1 << 24, block: int = 1 << 16) -> tuple[int, int]:
+    """
+    Solve both parts with bounded memory, for inputs larger than RAM
+
+    The input is read in chunks, each chunk is sorted and its columns written as
+    temporary memory mapped runs, which are then k-way merged back together.
+    Memory use is about one chunk while sorting, then one block per run while merging.
+
+    Args:
+        inp (str):
+            path to the input file
+        chunk_size (int):
+            bytes of input sorted at once
+        block (int):
+            elements read from each run at a time while merging
+
+    Returns:
+        tuple: (part 1, part 2)
+    """
+    import tempfile
+
+    with tempfile.TemporaryDirectory(prefix="day01-") as directory:
+        left, right = write_runs(inp, directory, chunk_size)
+
+        # total distance pairs the merged columns up by rank
+        distance = 0
+        for a, b in zip(merged(left, block), merged(right, block)):
+            distance += abs(a - b)
+
+        # similarity pairs them up by value, a merge join of the two sorted streams
+        similarity = 0
+        left_counts = counted(merged(left, block))
+        right_counts = counted(merged(right, block))
+        a = next(left_counts, None)
+        b = next(right_counts, None)
+        while a is not None and b is not None:
+            if a[0] == b[0]:
+                similarity += a[0] * a[1] * b[1]
+                a = next(left_counts, None)
+                b = next(right_counts, None)
+            elif a[0] < b[0]:
+                a = next(left_counts, None)
+            else:
+                b = next(right_counts, None)
+
+        # release the maps before the directory is removed
+        del left, right
+
+    return distance, similarity
 
-        result = 0
-        for item in self.lists["l"]:
-            try:
-                result += self._counts[item] * item
-            except KeyError:
-                pass
 
-        self._perf["run 2"] = time.perf_counter() - t0
-        return result
+def part_1(inp: str) -> int:
+    return Solver(inp).run_part_1()
 
 
-    def print_perf_info(self) -> None:
-        """Prints a dict of performance info"""
-        for step, dt in self._perf.items():
-            print(f"step: {step}, {dt:.2f}s")
+def part_2(inp: str) -> int:
+    return Solver(inp).run_part_2()
 
 
 if __name__ == "__main__":
@@ -122,6 +223,8 @@ if __name__ == "__main__":
 
     assert test_run.run_part_1() == 11, test_run.run_part_1()
     assert test_run.run_part_2() == 31, test_run.run_part_2()
+    # tiny chunks, so the test input is split into several runs
+    assert solve_streaming("./Input/input_test.txt", chunk_size=16) == (11, 31)
 
     slv = Solver("./Input/input.txt")
 
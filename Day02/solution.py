@@ -1,11 +1,161 @@
 """
 Day 2 Solution
 """
-import copy
-from ast import Index
+import concurrent.futures
+import os
+
+import numpy as np
 
 from lib.base_solver import BaseSolver
 
+# allowed step between adjacent levels, in the direction of the report
+MIN_STEP = 1
+MAX_STEP = 3
+
+
+def report_safety(levels: np.ndarray, lengths: np.ndarray, dampener: bool = False) -> np.ndarray:
+    """
+    Safety of every report at once
+
+    Rules:
+
+    1. Levels must be either all increasing or decreasing. No inflections
+    2. Adjacent levels must differ by no more than 3, and no less than 1
+
+    With the dampener, a report is also safe if removing any single level makes
+    it safe. Removing level k leaves the pairs before k, the pairs after k, and
+    the bridging pair (k - 1, k + 1), so running prefix and suffix validity
+    checks every removal in O(length) without copying the report.
+
+    Args:
+        levels (np.ndarray):
+            (reports, width) levels, padded past the end of each report
+        lengths (np.ndarray):
+            number of levels in each report
+        dampener (bool):
+            tolerate a single bad level
+
+    Returns:
+        np.ndarray: bool per report
+    """
+    nreports, width = levels.shape
+    lengths = lengths[:, np.newaxis]
+    cols = np.arange(width)
+
+    # padding pairs and bridges always pass, so they never break a report
+    diff = np.diff(levels, axis=1)
+    diff_pad = cols[:-1] >= lengths - 1
+    bridge = levels[:, 2:] - levels[:, :-2]
+    bridge_pad = cols[1:-1] >= lengths - 1
+
+    safe = np.zeros(nreports, dtype=bool)
+    for direction in (1, -1):
+        good = ((MIN_STEP <= direction * diff) & (direction * diff <= MAX_STEP)) | diff_pad
+        safe |= good.all(axis=1)
+
+        if not dampener:
+            continue
+
+        # prefix[:, k]: pairs among levels 0..k-1 are good
+        prefix = np.ones((nreports, width), dtype=bool)
+        prefix[:, 2:] = np.logical_and.accumulate(good, axis=1)[:, :-1]
+        # suffix[:, k]: pairs among levels k+1.. are good
+        suffix = np.ones((nreports, width), dtype=bool)
+        suffix[:, :-2] = np.logical_and.accumulate(good[:, ::-1], axis=1)[:, ::-1][:, 1:]
+        # joined[:, k]: levels k-1 and k+1 may be adjacent once k is gone
+        joined = np.ones((nreports, width), dtype=bool)
+        joined[:, 1:-1] = ((MIN_STEP <= direction * bridge) & (direction * bridge <= MAX_STEP)) | bridge_pad
+
+        removable = prefix & suffix & joined & (cols < lengths)
+        safe |= removable.any(axis=1)
+
+    return safe
+
+
+def pack_reports(text: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pack reports into a padded (reports, width) array
+
+    Returns:
+        tuple: (levels, lengths)
+    """
+    lengths = np.array([len(row.split()) for row in text.split("\n")], dtype=np.int64)
+    lengths = lengths[lengths > 0]
+    values = np.fromstring(text, dtype=np.int64, sep=" ")
+
+    levels = np.zeros((len(lengths), lengths.max(initial=0)), dtype=np.int64)
+    levels[np.arange(levels.shape[1]) < lengths[:, np.newaxis]] = values
+
+    return levels, lengths
+
+
+def split_ranges(inp: str, chunk_size: int) -> list[tuple[int, int]]:
+    """
+    Split a file into byte ranges of about chunk_size, ending on line boundaries
+
+    Returns:
+        list: [(start, end), ...] covering the whole file
+    """
+    size = os.path.getsize(inp)
+
+    ranges = []
+    start = 0
+    with open(inp, "rb") as o:
+        while start < size:
+            o.seek(min(start + chunk_size, size))
+            # run on to the end of the current line
+            o.readline()
+            end = min(o.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def count_range(inp: str, start: int, end: int) -> tuple[int, int]:
+    """
+    Worker entry point, counts the safe reports in one byte range of the input
+
+    Returns:
+        tuple: (safe, safe with the dampener)
+    """
+    with open(inp, "rb") as o:
+        o.seek(start)
+        text = o.read(end - start).decode()
+
+    levels, lengths = pack_reports(text)
+    safe = int(np.count_nonzero(report_safety(levels, lengths)))
+    damped = int(np.count_nonzero(report_safety(levels, lengths, dampener=True)))
+    return safe, damped
+
+
+def count_streaming(inp: str, workers: int | None = None, chunk_size: int = 1 << 24) -> tuple[int, int]:
+    """
+    Count safe reports without loading the whole input, for very large files
+
+    The file is split into byte ranges at line boundaries and each range is
+    evaluated in a process pool. Only the counts come back, so memory is
+    bounded by one chunk per worker.
+
+    Args:
+        inp (str):
+            path to the input file
+        workers (int):
+            pool size, defaults to the cpu count
+        chunk_size (int):
+            approximate bytes per chunk
+
+    Returns:
+        tuple: (safe, safe with the dampener)
+    """
+    safe = damped = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(count_range, inp, start, end) for start, end in split_ranges(inp, chunk_size)]
+        for future in concurrent.futures.as_completed(futures):
+            a, b = future.result()
+            safe += a
+            damped += b
+    return safe, damped
+
 
 class Solver(BaseSolver):
     """
@@ -14,77 +164,36 @@ class Solver(BaseSolver):
     def __init__(self, inp: str):
         super().__init__(inp=inp)
 
+    def _parse_reports(self) -> dict[str, np.ndarray]:
+        """Pack the reports into a padded (reports, width) array, with their lengths"""
+        levels, lengths = pack_reports(self.data)
+
+        return {"levels": levels, "lengths": lengths}
+
     def get_safety(
         self,
         dampener: bool = False,
-    ) -> list[bool]:
+    ) -> np.ndarray:
         """Extract safety levels in accordance with rules"""
+        reports = self.cached("reports", 1, self._parse_reports)
 
-        def pairwise_compare(u: int, v: int, increasing: bool):
-            """Compare 2 levels, applying rules"""
-            # we're increasing, expecting v to be greater than u
-            if increasing and u > v:
-                return False
-            if not increasing and u < v:
-                return False
-            dv = abs(u - v)
-            if dv > 3:
-                return False
-            if dv < 1:
-                return False
-            return True
-
-        def test_rules(levels_test, local_dampener):
-            """
-            Inner function to test rules:
-
-            1. Levels must be either all increasing or decreasing. No inflections
-                This can probably be done with a 2nd order derivative, also
-            2. Adjacent levels must differ by no more than 3, and no less than 1
-            """
-            # print(f"\ntesting levels: {levels}")
-            increasing = levels_test[0] < levels_test[1]
-
-            for i in range(len(levels_test) - 1):
-                # get two values to compare
-                u = levels_test[i]
-                v = levels_test[i + 1]
-
-                safe = pairwise_compare(u, v, increasing)
-
-                if not safe:
-                    if local_dampener:
-                        # oh god
-                        recursive = []
-                        for j in range(len(levels_test)):
-                            tmp = copy.deepcopy(levels_test)
-                            del tmp[j]
-                            recursive.append(test_rules(tmp, local_dampener=False))
-
-                        if not any(recursive):
-                            return False
-                    else:
-                        return False
-
-            return True
-
-        output = []
-        for report in self.data.split("\n"):
-            # get integer levels of each report
-            levels = [int(level) for level in report.strip().split(" ")]
-            output.append(test_rules(levels, local_dampener=dampener))
-
-        return output
+        return report_safety(reports["levels"], reports["lengths"], dampener=dampener)
 
     def total_safe(self) -> int:
         """Solution to part 1, returns a count of the number of safe reports"""
-        # summation of bools is equivalent to counting the True
-        return sum(self.get_safety(dampener=False))
+        return int(np.count_nonzero(self.get_safety(dampener=False)))
 
     def total_damped_safe(self) -> int:
-        """Solution to part 1, returns a count of the number of safe reports"""
-        # summation of bools is equivalent to counting the True
-        return sum(self.get_safety(dampener=True))
+        """Solution to part 2, returns a count of the number of reports that are safe with the dampener"""
+        return int(np.count_nonzero(self.get_safety(dampener=True)))
+
+
+def part_1(inp: str) -> int:
+    return Solver(inp).total_safe()
+
+
+def part_2(inp: str) -> int:
+    return Solver(inp).total_damped_safe()
 
 
 if __name__ == "__main__":
@@ -96,6 +205,9 @@ if __name__ == "__main__":
     print("verify part 2")
     test_2 = test.total_damped_safe()
     assert test_2 == 4, test_2
+    # tiny chunks, so the test input is split over several workers
+    test_stream = count_streaming("Input/input_test.txt", workers=2, chunk_size=16)
+    assert test_stream == (2, 4), test_stream
 
     solution = Solver("Input/input.txt")
 
@@ -1,7 +1,23 @@
+import concurrent.futures
+import mmap
+import os
 import re
 
 from lib.base_solver import BaseSolver
 
+# every instruction in one alternation, so a single scan yields them in position order
+# the capture groups tell them apart: 1 and 2 for mul, 3 for do(), 4 for don't()
+# mul operands are 1-3 digits, which bounds MARGIN
+PATTERN = r"mul\((\d{1,3}),(\d{1,3})\)|(do\(\))|(don't\(\))"
+INSTRUCTIONS = re.compile(PATTERN)
+# the same, for scanning raw bytes
+INSTRUCTIONS_BYTES = re.compile(PATTERN.encode())
+MUL = 2
+DO = 3
+
+# a token starting inside a chunk can run on this far past its end
+MARGIN = len("mul(999,999)") - 1
+
 
 class Solver(BaseSolver):
     def __init__(self, inp: str):
@@ -15,36 +31,114 @@ class Solver(BaseSolver):
             flow:
                 enable the flow control of part 2
         """
-        # first, get each pair and extract the integers and their location index
-        instruct_mul = {}
-        for mul in re.finditer(r"mul\((\d*),(\d*)\)", self.data):
-            instruct_mul[mul.start(0)] = (mul.group(1), mul.group(2))
-        # generate a list of "breakpoints" where multiplication should be turned on or off
-        # but only if flow control is enabled
-        do = []
-        dont = []
-        if flow:
-            for m in re.finditer(r"do\(\)", self.data):
-                do.append(m.start(0))
-
-            for m in re.finditer(r"don't\(\)", self.data):
-                dont.append(m.start(0))
         # keep a running total, summing all valid mul(a,b) strings
-        sum = 0
+        total = 0
         enable = True  # start with addition enabled
-        for idx, pair in instruct_mul.items():
-            # consume do and dont lists, enabling or disabling as wed go
-            if len(do) > 0 and idx > do[0]:
-                enable = True
-                del do[0]
-            if len(dont) > 0 and idx > dont[0]:
-                enable = False
-                del dont[0]
-            # if we can, sum
-            if enable:
-                sum += int(pair[0]) * int(pair[1])
+        for match in INSTRUCTIONS.finditer(self.data):
+            kind = match.lastindex
+            if kind == MUL:
+                # only parse the integers if we can sum
+                if enable:
+                    total += int(match.group(1)) * int(match.group(2))
+            elif flow:
+                # do and don't switch addition on or off from here on
+                enable = kind == DO
+
+        return total
+
+
+def scan_chunk(inp: str, start: int, end: int) -> tuple[int, int, int, bool | None]:
+    """
+    Worker entry point, scans the instructions starting within [start, end) of the input
+
+    The scan runs on MARGIN bytes past end, so tokens crossing the boundary
+    still belong to the chunk they start in. The enable state coming in from the
+    previous chunk is unknown, so the sum is reported for both cases.
+
+    Returns:
+        tuple: (sum of every mul,
+                sum of enabled muls if the chunk starts enabled,
+                sum of enabled muls if the chunk starts disabled,
+                state at the end of the chunk, None if it has no do() or don't())
+    """
+    with open(inp, "rb") as o, mmap.mmap(o.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        total = 0
+        # muls before the first do() or don't() depend on the incoming state
+        leading = 0
+        # after it, the state is known, and both cases agree
+        enabled = 0
+        state = None
+        for match in INSTRUCTIONS_BYTES.finditer(data, start, min(end + MARGIN, len(data))):
+            if match.start() >= end:
+                break
+            if match.lastindex == MUL:
+                value = int(match.group(1)) * int(match.group(2))
+                total += value
+                if state is None:
+                    leading += value
+                elif state:
+                    enabled += value
+            else:
+                state = match.lastindex == DO
+
+    return total, leading + enabled, enabled, state
+
+
+def stitch(partials) -> tuple[int, int]:
+    """
+    Combine ordered scan_chunk results, carrying the enable state across chunks
+
+    Returns:
+        tuple: (part 1, part 2)
+    """
+    part_1 = part_2 = 0
+    enable = True  # start with addition enabled
+    for total, if_enabled, if_disabled, state in partials:
+        part_1 += total
+        part_2 += if_enabled if enable else if_disabled
+        if state is not None:
+            enable = state
+    return part_1, part_2
 
-        return sum
+
+def scan_parallel(inp: str, workers: int | None = None, chunk_size: int = 1 << 26) -> tuple[int, int]:
+    """
+    Solve both parts over a memory mapped input, scanning chunks in a process pool
+
+    The file is never read into a python string, each worker scans its chunk
+    of the map directly
+
+    Args:
+        inp (str):
+            path to the input file
+        workers (int):
+            pool size, defaults to the cpu count
+        chunk_size (int):
+            bytes per chunk
+
+    Returns:
+        tuple: (part 1, part 2)
+    """
+    size = os.path.getsize(inp)
+    starts = range(0, size, chunk_size)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        # map keeps the chunks in order, which stitch relies on
+        partials = pool.map(
+            scan_chunk,
+            [inp] * len(starts),
+            starts,
+            [min(start + chunk_size, size) for start in starts],
+        )
+        return stitch(partials)
+
+
+def part_1(inp: str) -> int:
+    return Solver(inp).run(flow=False)
+
+
+def part_2(inp: str) -> int:
+    return Solver(inp).run(flow=True)
 
 
 if __name__ == "__main__":
@@ -56,6 +150,10 @@ if __name__ == "__main__":
     test_2 = test.run(flow=True)
     assert test_2 == 48
 
+    # tiny chunks, so tokens and flow control cross chunk boundaries
+    test_parallel = scan_parallel("Input/input_test_2.txt", workers=2, chunk_size=5)
+    assert test_parallel == (161, 48), test_parallel
+
     print("run part 1")
     sol = Solver("Input/input.txt")
 
@@ -1,9 +1,7 @@
-import re
-from typing import Union
-
 import numpy as np
 
-from lib.base_solver import BaseSolver
+from lib.base_solver import BaseSolver, DEBUG
+from lib.grid import OFF_GRID, topology
 
 
 class Solver(BaseSolver):
@@ -12,44 +10,28 @@ class Solver(BaseSolver):
         super().__init__(inp=inp)
 
     def run(self) -> int:
-        # use a sliding window to search. This window can be 4x1, 1x4 or 4x4 (diag)
-        # horizontal search
-        count = self.findall(self.data)  # no reason to regenerate the text here
-        # vertical search
-        count += self.findall(self.array.T)
-
-        # for the diagonals, we can simulate this by padding the array and rolling it by index
-        pad = np.concat((self.array.T, np.full_like(self.array, " ")), axis=1)
-
-        diag_down = []
-        for idx, row in enumerate(pad):
-            diag_down.append(np.roll(row, idx))
-
-        diag_down = np.array(diag_down).T
-
-        count += self.findall(diag_down)
-
-        # diag_up
-        pad = np.concat((np.full_like(self.array, " "), self.array.T), axis=1)
-        diag_up = []
-        for idx, row in enumerate(pad):
-            diag_up.append(np.roll(row, -idx))
+        # walk outwards from every X in all 8 directions at once, checking the
+        # next 3 letters against "MAS". Each hop is one gather from the neighbour table
+        topo = topology(self.shape, connectivity=8)
 
-        diag_up = np.array(diag_up).T
+        # OFF_GRID (-1) indexes the last entry, so append a blank letter, and a
+        # neighbour row that stays off the grid
+        letters = np.append(self.array.ravel(), "")
+        table = np.vstack((topo.neighbours, np.full(topo.connectivity, OFF_GRID)))
 
-        with open("Input/skew_test.txt", "w+") as o:
-            o.write(self.regenerate_text(diag_up))
+        cells = np.flatnonzero(letters == "X")
+        directions = np.arange(topo.connectivity)
+        # (cells, directions) position of the current letter along each ray
+        ray = np.broadcast_to(cells[:, np.newaxis], (len(cells), len(directions)))
 
-        count += self.findall(diag_up)
+        found = np.ones(ray.shape, dtype=bool)
+        for letter in "MAS":
+            ray = table[ray, directions]
+            found &= letters[ray] == letter
 
-        return count
-
-    def findall(self, string: Union[str, "np.array"]) -> int:
-        """Find all XMAS/SAMX instances"""
-        if not isinstance(string, str):
-            string = self.regenerate_text(string)
+        self.trace(DEBUG, lambda: topo.unravel(cells[found.any(axis=1)]))
 
-        return len(re.findall(r"XMAS", string)) + len(re.findall("SAMX", string))
+        return int(found.sum())
 
 
 class Solver2(Solver):
@@ -60,7 +42,7 @@ class Solver2(Solver):
     def run(self) -> int:
         # use a 3x3 window centered on each A instance
 
-        coords = zip(*np.where(self.array == "A"))
+        coords = self.symbol_points("A")
 
         count = 0
         for point in coords:
@@ -101,6 +83,14 @@ class Solver2(Solver):
         return count
 
 
+def part_1(inp: str) -> int:
+    return Solver(inp).run()
+
+
+def part_2(inp: str) -> int:
+    return Solver2(inp).run()
+
+
 if __name__ == "__main__":
     test = Solver("Input/input_test.txt")
 
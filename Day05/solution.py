@@ -1,9 +1,13 @@
 import math
-from typing import Union
+from typing import TYPE_CHECKING, Union
 
-from lib.base_solver import BaseSolver
+import numpy as np
 
-import networkx as nx
+from lib.base_solver import BaseSolver, DEBUG
+from lib.shortest_path import CSRGraph
+
+if TYPE_CHECKING:
+    import networkx as nx
 
 
 class Rule:
@@ -69,18 +73,37 @@ class Rule:
 
 class Solver(BaseSolver):
 
-    __slots__ = ["_rules", "_updates"]
+    __slots__ = ["_rules", "_updates", "_edges"]
 
     def __init__(self, inp: str):
         super().__init__(inp=inp)
 
-        self._rules: list[Rule] = []
-        self._updates: list[list[int]] = []
-        for line in self.data.split("\n"):
+        arrays = self.cached("rules_updates", 1, self._parse)
+
+        self._rules: list[Rule] = [Rule(a, b) for a, b in arrays["rules"].tolist()]
+        self._edges = CSRGraph.from_edges(arrays["rules"][:, 0], arrays["rules"][:, 1])
+        # updates are stored flat, split them back up at their offsets
+        pages = arrays["pages"].tolist()
+        offsets = arrays["offsets"].tolist()
+        self._updates: list[list[int]] = [pages[u:v] for u, v in zip(offsets, offsets[1:])]
+
+    def _parse(self) -> dict[str, np.ndarray]:
+        """Parse rules and updates into arrays"""
+        rules = []
+        pages = []
+        offsets = [0]
+        for line in self.rows:
             if "|" in line:
-                self._rules.append(Rule(*self._sanitise_to_int(line.split("|"))))
+                rules.append(self._sanitise_to_int(line.split("|")))
             elif line.strip() != "":
-                self._updates.append(self._sanitise_to_int(line.split(",")))
+                pages += self._sanitise_to_int(line.split(","))
+                offsets.append(len(pages))
+
+        return {
+            "rules": np.array(rules, dtype=np.int64).reshape(-1, 2),
+            "pages": np.array(pages, dtype=np.int64),
+            "offsets": np.array(offsets, dtype=np.int64),
+        }
 
     @staticmethod
     def _sanitise_to_int(inp: list[str]) -> list[int]:
@@ -95,10 +118,18 @@ class Solver(BaseSolver):
     def updates(self) -> list[list[int]]:
         return self._updates
 
-    def get_graph(self) -> nx.DiGraph:
+    @property
+    def edges(self) -> CSRGraph:
+        """Rules as a compact directed graph, for direct edge lookups"""
+        return self._edges
+
+    def get_graph(self) -> "nx.DiGraph":
         """
         Generate a directed graph of all rules
         """
+        # networkx is slow to import, defer it until a graph is needed
+        import networkx as nx
+
         G = nx.DiGraph()
         for rule in self.rules:
             G.add_edge(rule.a, rule.b)
@@ -106,13 +137,16 @@ class Solver(BaseSolver):
         return G
 
     def run(self) -> (int, int):
+        import networkx as nx
+
         # first, get the graph
+        # this is only needed to fix invalid updates, direct edges are checked on self.edges
         graph = self.get_graph()
 
         valid_updates = []
         fixed_updates = []
         for update in self.updates:
-            print(f"assessing update {update}", end = "... ")
+            self.trace(DEBUG, "assessing update {}", update, end="... ")
             valid = True
             for idx in range(len(update) - 1):
                 # check each "edge" in this update list
@@ -123,28 +157,24 @@ class Solver(BaseSolver):
                 # also check that the path is direct
                 # this assumes that a rule covers this transition
                 # however the solution works, so I guess we proved that?
-                path = None
-                if nx.has_path(graph, u, v):
-                    path = nx.shortest_path(graph, u, v)
-                # check that we have a path, and that it's direct
-                if path is None or len(path) != 2:
+                if not self.edges.has_edge(u, v):
                     # invalidate and stop searching
                     valid = False
                     break
             # valid update, no further processing needed
             if valid:
-                print("valid")
+                self.trace(DEBUG, "valid")
                 valid_updates.append(update)
             else:
                 # if we're invalid, we need to conform this list to the graph
                 # lets create a subgraph containing only those nodes and then
                 # find the longest path
-                print("invalid")
+                self.trace(DEBUG, "invalid")
                 subgraph = graph.subgraph(update)
                 fixed_update = nx.dag_longest_path(subgraph)
                 fixed_updates.append(fixed_update)
                 # indent point is here;  {fixed_update}
-                print(f"       ┗╸ fixed: {fixed_update}")
+                self.trace(DEBUG, "       ┗╸ fixed: {}", fixed_update)
 
         # now get the central number from each update
         valid_midpoints = self.get_midpoints(valid_updates)
@@ -161,6 +191,15 @@ class Solver(BaseSolver):
 
         return midpoints
 
+
+def part_1(inp: str) -> int:
+    return Solver(inp=inp).run()[0]
+
+
+def part_2(inp: str) -> int:
+    return Solver(inp=inp).run()[1]
+
+
 if __name__ == "__main__":
     import time
 
@@ -2,9 +2,7 @@ import copy
 import time
 from multiprocessing import Pool, cpu_count
 
-import numpy as np
-
-from lib.base_solver import BaseSolver
+from lib.base_solver import BaseSolver, DEBUG
 
 
 class Position:
@@ -71,9 +69,7 @@ class Solver(BaseSolver):
     def __init__(self, inp: str):
         super().__init__(inp=inp)
 
-        obs_i, obs_j = np.where(self.array == "#")
-        # numpy int repr is ugly, convert
-        self._obstacles = list(zip([int(i) for i in obs_i], [int(j) for j in obs_j]))
+        self._obstacles = self.points_where("#")
 
     def run_path(self, added_obstacle: tuple | None = None) -> [list, bool]:
         # get obstacle coords
@@ -83,12 +79,12 @@ class Solver(BaseSolver):
 
         # area boundaries
         # if coord == bound, we're outside
-        imax, jmax = self.array.shape
+        imax, jmax = self.shape
 
         # starting location
-        ui, uj = np.where(self.array == "^")
+        ui, uj = self.symbol_points("^")[0].tolist()
         # create an initial position
-        pos = Position(int(ui[0]), int(uj[0]), "n")
+        pos = Position(ui, uj, "n")
         # step through all positions until we walk out of bounds
         path = [pos]
         cardinal = {
@@ -139,7 +135,7 @@ class Solver(BaseSolver):
         loops = 0
         new = list(set(new))
         for idx, addition in enumerate(new):
-            print(f"running with added obstacle {idx+1}/{len(new)}: {addition}")
+            self.trace(DEBUG, "running with added obstacle {}/{}: {}", idx + 1, len(new), addition)
             path, loop = self.run_path(added_obstacle=addition)
 
             if loop:
@@ -156,6 +152,14 @@ class Solver(BaseSolver):
         return loops - 1  # exclude the position right in front of the guard
 
 
+def part_1(inp: str) -> int:
+    return Solver(inp=inp).run()
+
+
+def part_2(inp: str) -> int:
+    return Solver(inp=inp).find_loops()
+
+
 if __name__ == "__main__":
 
     test = Solver(inp="Input/input_test.txt")
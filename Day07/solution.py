@@ -65,6 +65,14 @@ class Solver(BaseSolver):
         return sum(achievable)
 
 
+def part_1(inp: str) -> int:
+    return Solver(inp=inp).run()
+
+
+def part_2(inp: str) -> int:
+    return Solver(inp=inp).run(concat=True)
+
+
 if __name__ == "__main__":
 
     test = Solver(inp="Input/input_test.txt")
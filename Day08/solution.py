@@ -1,10 +1,9 @@
 import copy
-import itertools
 import time
 
 import numpy as np
 
-from lib.base_solver import BaseSolver
+from lib.base_solver import BaseSolver, DEBUG, INFO
 
 
 class Solver(BaseSolver):
@@ -12,71 +11,56 @@ class Solver(BaseSolver):
     def __init__(self, inp: str):
         super().__init__(inp=inp)
 
-    def create_node(self, source: tuple[int, int], delta: tuple[int, int], add: bool = True) -> tuple[int, int]:
-        if add:
-            return source[0] + delta[0], source[1] + delta[1]
-        else:
-            return source[0] - delta[0], source[1] - delta[1]
-
     def run(self, resonant: bool = False):
-        block = [".", "\n"]
-        freqlist = [char for char in list(set(self.data)) if char not in block]
+        freqlist = [char for char in self.symbol_index if char != "."]
 
-        print(f"total list of frequencies: {freqlist}")
-        print(f"array shape: {self.array.shape}")
+        self.trace(INFO, "total list of frequencies: {}", freqlist)
+        self.trace(INFO, "array shape: {}", self.shape)
 
         new_locations = []
         for freq in freqlist:
             # locations for this frequency
-            points = self.points_where(freq)
+            points = self.symbol_points(freq)
             # every pair combo
-            pairs = list(itertools.combinations(points, 2))
-
-            for pair in pairs:
-                di = pair[0][0] - pair[1][0]
-                dj = pair[0][1] - pair[1][1]
-
-                if not resonant:
-                    pos = self.create_node(pair[0], (di, dj))
-                    if self.check_inside_bounds(pos):
-                        new_locations.append(pos)
-
-                    neg = self.create_node(pair[1], (di, dj), add=False)
-                    if self.check_inside_bounds(neg):
-                        new_locations.append(neg)
-                # if we're using the part 2 features, created a "mirrored ray"
-                # essentially, create every point that goes _through_ the other antenna
-                else:
-                    cont = True
-                    pos = pair[1]
-                    while cont:
-                        pos = self.create_node(pos, (di, dj))
-
-                        if self.check_inside_bounds(pos):
-                            new_locations.append(pos)
-                        else:
-                            cont = False
-                    cont = True
-                    pos = pair[0]
-                    while cont:
-                        pos = self.create_node(pos, (di, dj), add=False)
-
-                        if self.check_inside_bounds(pos):
-                            new_locations.append(pos)
-                        else:
-                            cont = False
+            u, v = np.triu_indices(len(points), k=1)
+            first = points[u]
+            second = points[v]
+            delta = first - second
+
+            if not resonant:
+                candidates = np.concatenate((first + delta, second - delta))
+            # if we're using the part 2 features, created a "mirrored ray"
+            # essentially, create every point that goes _through_ the other antenna
+            else:
+                # no ray can stay inside the grid for more steps than its longest side
+                steps = np.arange(1, max(self.shape) + 1)[:, np.newaxis, np.newaxis]
+                candidates = np.concatenate((
+                    (second + steps * delta).reshape(-1, 2),
+                    (first - steps * delta).reshape(-1, 2),
+                ))
+
+            new_locations.append(candidates[self.check_inside_bounds_batch(candidates)])
+
+        new_locations = np.concatenate(new_locations) if new_locations else np.empty((0, 2), dtype=np.intp)
 
         # get unique locations
         display = copy.deepcopy(self.array)
-        for loc in new_locations:
-            display[loc[0], loc[1]] = "#"
-        print(self.regenerate_text(display, spacing=1))
+        display[new_locations[:, 0], new_locations[:, 1]] = "#"
+        self.trace(DEBUG, lambda: self.regenerate_text(display, spacing=1))
 
         reduction = np.unique(display, return_counts=True)
 
         return reduction[1][list(reduction[0]).index("#")]
 
 
+def part_1(inp: str) -> int:
+    return Solver(inp=inp).run()
+
+
+def part_2(inp: str) -> int:
+    return Solver(inp=inp).run(resonant=True)
+
+
 if __name__ == "__main__":
 
     test = Solver(inp="Input/input_test.txt")
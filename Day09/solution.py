@@ -1,7 +1,9 @@
 import copy
 import time
 
-from lib.base_solver import BaseSolver
+import numpy as np
+
+from lib.base_solver import BaseSolver, INFO
 
 
 class FileSegment:
@@ -201,26 +203,31 @@ class Solver(BaseSolver):
         if self._filesystem is not None:
             return self._filesystem
 
+        blocks = self.cached("blocks", 1, self._parse_blocks)
+
         fs = FileSystem()
-        idx = 0
-        file = True
-        for item in self.data:
-            if file:
-                for i in range(int(item)):
-                    segment = FileSegment(int(item), idx)
-                    segment._segment_id = len(fs._sequence)
-                    fs.append(segment)
-                idx += 1
-            else:
-                for i in range(int(item)):
-                    segment = FileSegment(int(item), -1)
-                    segment._segment_id = len(fs._sequence)
-                    fs.append(segment)
-
-            file = not file
+        for seg_id, (size, file_id) in enumerate(zip(blocks["sizes"].tolist(), blocks["ids"].tolist())):
+            segment = FileSegment(size, file_id)
+            segment._segment_id = seg_id
+            fs.append(segment)
+
         self._filesystem = fs
         return self._filesystem
 
+    def _parse_blocks(self) -> dict[str, np.ndarray]:
+        """
+        Expand the disk map into one entry per block
+
+        Returns:
+            dict: {"ids": file id of each block (-1 for free space), "sizes": size of the run each block is in}
+        """
+        sizes = np.array([int(c) for c in self.data.strip()], dtype=np.int64)
+        runs = np.arange(len(sizes))
+        # even runs are files, numbered in order, odd runs are free space
+        ids = np.where(runs % 2 == 0, runs // 2, -1)
+
+        return {"ids": np.repeat(ids, sizes), "sizes": np.repeat(sizes, sizes)}
+
     def compress(self, fs: FileSystem) -> FileSystem:
         seq = fs.sequence
 
@@ -272,7 +279,7 @@ class Solver(BaseSolver):
         return fs
 
     def run(self, frag: bool = True) -> int:
-        print("Compressing... ", end="")
+        self.trace(INFO, "Compressing... ", end="")
         if frag:
             compressed = self.compress(self.filesytem)
         else:
@@ -283,16 +290,24 @@ class Solver(BaseSolver):
     def get_checksum(self, compressed: FileSystem, verbose=True) -> int:
         checksum = 0
         if verbose:
-            print("Done.\nGenerating checksum... ", end=" ")
+            self.trace(INFO, "Done.\nGenerating checksum... ", end=" ")
         for idx, item in enumerate(compressed.sequence):
             if item.id != -1:
                 checksum += idx * item.id
         if verbose:
-            print("Done.")
+            self.trace(INFO, "Done.")
 
         return checksum
 
 
+def part_1(inp: str) -> int:
+    return Solver(inp=inp).run()
+
+
+def part_2(inp: str) -> int:
+    return Solver(inp=inp).run(frag=False)
+
+
 if __name__ == "__main__":
     test = Solver(inp="Input/input_test.txt")
     test_1_run = test.run()
@@ -3,7 +3,8 @@ import copy
 import math
 import time
 
-from lib.base_solver import BaseSolver
+from lib.base_solver import BaseSolver, DEBUG
+from lib.grid import topology
 
 
 class Position:
@@ -45,37 +46,20 @@ class Position:
     def h(self):
         return self._h
 
-    def all_adjacent(self, max_i: int, max_j: int):
-        adj = []
-        if self.i > 0:
-            pos = (self.i - 1, self.j)
-            adj.append(pos)
-        if self.j > 0:
-            pos = (self.i, self.j - 1)
-            adj.append(pos)
-        if self.i < max_i - 1:
-            pos = (self.i + 1, self.j)
-            adj.append(pos)
-        if self.j < max_j - 1:
-            pos = (self.i, self.j + 1)
-            adj.append(pos)
-
-        return adj
-
 
 def bfs(array: list[list[Position]], node: Position, full_search: bool = False) -> list[Position]:
     queue = collections.deque()
     queue.append(node)
 
-    max_i = len(array)
     max_j = len(array[0])
+    topo = topology((len(array), max_j))
 
     explored = []
     while len(queue) > 0:
         test = queue.popleft()
 
         # print(f"testing {test}, {test.h}")
-        adj = [array[pos[0]][pos[1]] for pos in test.all_adjacent(max_i, max_j)]
+        adj = [array[n // max_j][n % max_j] for n in topo.adjacent(test.i * max_j + test.j)]
 
         for node in adj:
             if not node.explored and node.h == test.h + 1:
@@ -92,10 +76,10 @@ def dfs(array: list[list[Position]], node: Position, full_search: bool = False)
     if not full_search:
         node.explored = True
 
-    max_i = len(array)
     max_j = len(array[0])
+    topo = topology((len(array), max_j))
 
-    adj = [array[pos[0]][pos[1]] for pos in node.all_adjacent(max_i, max_j)]
+    adj = [array[n // max_j][n % max_j] for n in topo.adjacent(node.i * max_j + node.j)]
     traversed = [node]
     for test in adj:
         if not test.explored and test.h == node.h + 1:
@@ -141,19 +125,20 @@ class Solver(BaseSolver):
 
             dfs_path = dfs(copy.deepcopy(self.pos_array), first, full_search=full_search)
 
-            pth = []
-            pks = []
-            for node in sorted(dfs_path, key=lambda x: x.h):
-                if node.h == 9:
-                    pks.append((node.i, node.j))
-                elif node.h != 0:
-                    pth.append((node.i, node.j))
-            print(first)
-            print(self.regenerate_coloured_text(self.array, colours={
-                "blue": [(first.i, first.j)],
-                "red": pth,
-                "green": pks,
-            }))
+            if self.verbosity >= DEBUG:
+                pth = []
+                pks = []
+                for node in sorted(dfs_path, key=lambda x: x.h):
+                    if node.h == 9:
+                        pks.append((node.i, node.j))
+                    elif node.h != 0:
+                        pth.append((node.i, node.j))
+                self.trace(DEBUG, first)
+                self.trace(DEBUG, self.regenerate_coloured_text(self.array, colours={
+                    "blue": [(first.i, first.j)],
+                    "red": pth,
+                    "green": pks,
+                }))
 
             for node in dfs_path:
                 if node.h == 9:
@@ -162,6 +147,14 @@ class Solver(BaseSolver):
         return peaks
 
 
+def part_1(inp: str) -> int:
+    return Solver(inp=inp).run(full_search=False)
+
+
+def part_2(inp: str) -> int:
+    return Solver(inp=inp).run(full_search=True)
+
+
 if __name__ == "__main__":
 
     test_1 = Solver(inp="Input/input_test.txt")
@@ -1,7 +1,7 @@
 import functools
 import time
 
-from lib.base_solver import BaseSolver
+from lib.base_solver import BaseSolver, DEBUG, INFO
 
 
 class Solver(BaseSolver):
@@ -13,10 +13,10 @@ class Solver(BaseSolver):
         stones = {}
         for stone in self.data.split(" "):
             try_add(stones, int(stone))
-        print(stones)
+        self.trace(DEBUG, stones)
 
         for blink in range(blinks):
-            print(f"processing blink {blink + 1}/{blinks}")
+            self.trace(INFO, "processing blink {}/{}", blink + 1, blinks)
 
             tmp = {}
             for stone, count in stones.items():
@@ -49,6 +49,14 @@ def try_add(cache: dict, num: int, count: int = 1):
         cache[num] = count
 
 
+def part_1(inp: str) -> int:
+    return Solver(inp=inp).run(blinks=25)
+
+
+def part_2(inp: str) -> int:
+    return Solver(inp=inp).run(blinks=75)
+
+
 if __name__ == "__main__":
 
     test_1 = Solver(inp="Input/input_test.txt")
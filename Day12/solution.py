@@ -1,15 +1,9 @@
 import time
 
 import numpy as np
-from networkx.algorithms.distance_measures import periphery
 
-from lib.base_solver import BaseSolver
-from lib.bfs import BFS
-
-
-class FloodFill(BFS):
-    def extra_condition(self, node: tuple[int, int], test: tuple[int, int]) -> bool:
-        return self.value(node) == self.value(test)
+from lib.base_solver import BaseSolver, DEBUG, INFO
+from lib.components import label_components
 
 
 class Solver(BaseSolver):
@@ -20,76 +14,51 @@ class Solver(BaseSolver):
     def run(self, discount: bool):
         types = np.unique(self.array)
 
-        explored = np.full(self.array.shape, 0)
-
-        print(types)
-
-        cost = 0
-        for i in range(self.array.shape[0]):
-            for j in range(self.array.shape[1]):
-                if explored[i, j] == 0:
-
-                    search = FloodFill(self.array)
-
-                    connected = search.search((i, j))
-
-                    explored[i, j] = 1
-                    for node in connected:
-                        explored[node[0], node[1]] = 1
-
-                    # print(self.regenerate_coloured_text(self.array, colours={"red": connected}))
-                    area = len(connected)
-
-                    directions = ["-i", "-j", "+i", "+j"]
-                    perimeter_points = {d: [] for d in directions}
-                    for point in connected:
-                        adj = search.get_adjacent(point, ignore_bounds=True)
-                        for direction, node in enumerate(adj):
-                            if node not in connected:
-                                perimeter_points[directions[direction]].append(node)
-
-                    if not discount:
-                        perimeter = sum(len(lst) for lst in perimeter_points.values())
-                    else:
-                        # With the "bulk discount" applied, the perimeter is "side degenerate".
-                        # That is to say, a side counts as 1 perimeter length
-                        # regardless of actual length
-                        if area == 1:
-                            # trivial case where there is only a single point
-                            perimeter = 4
-                        else:
-                            perimeter = 0
-
-                            for direction, points in perimeter_points.items():
-                                print(f"direction {direction}")
-                                # walk each direction, counting all non-continuous point instances
-                                test = (-10, -10)  # we should start from a test point far away
-                                if "i" in direction:
-                                    points = sorted(points, key=lambda x: (x[0], x[1]))
-                                else:
-                                    points = sorted(points, key=lambda x: (x[1], x[0]))
-                                for point in points:
-                                    # compare "test" against "point", ensuring that exactly one coordinate is the same
-                                    print(f"comparing {test} to {point}")
-                                    a, b = test
-                                    x, y = point
-
-                                    if direction in ["-i", "+i"] and abs(a - x) == 0 and abs(b - y) == 1:
-                                        print("\tskip")
-                                    elif direction in ["-j", "+j"] and abs(b - y) == 0 and abs(a - x) == 1:
-                                        print("\tskip")
-                                    else:
-                                        perimeter += 1
-                                        print(f"\tadding ({perimeter})")
-
-                                    test = point
-
-                            print(self.regenerate_coloured_text(self.array, colours={"red": connected}))
-                            print(perimeter)
-
-                    cost += area * perimeter
-
-        return cost
+        self.trace(INFO, types)
+
+        labels, area = label_components(self.array)
+
+        self.trace(INFO, "{} regions", len(area))
+
+        # pad with a label no region has, so the grid edge counts as a boundary
+        padded = np.pad(labels, 1, constant_values=-1)
+        centre = padded[1:-1, 1:-1]
+
+        def differs(di: int, dj: int) -> np.ndarray:
+            """True where the neighbour at (i + di, j + dj) is in another region"""
+            return padded[1 + di:padded.shape[0] - 1 + di, 1 + dj:padded.shape[1] - 1 + dj] != centre
+
+        up, down = differs(-1, 0), differs(1, 0)
+        left, right = differs(0, -1), differs(0, 1)
+
+        if not discount:
+            # each cell edge facing another region is one unit of perimeter
+            edges = up.astype(np.intp) + down + left + right
+        else:
+            # With the "bulk discount" applied, the perimeter is "side degenerate".
+            # That is to say, a side counts as 1 perimeter length
+            # regardless of actual length
+            # A polygon has as many sides as corners, so count corners instead.
+            # Convex corners: both orthogonal neighbours are outside the region
+            # Concave corners: both are inside, but the diagonal between them is not
+            edges = np.zeros(labels.shape, dtype=np.intp)
+            for a, b, di, dj in ((up, left, -1, -1), (up, right, -1, 1), (down, left, 1, -1), (down, right, 1, 1)):
+                edges += a & b
+                edges += ~a & ~b & differs(di, dj)
+
+        self.trace(DEBUG, lambda: edges)
+
+        perimeter = np.bincount(labels.ravel(), weights=edges.ravel(), minlength=len(area))
+
+        return int(np.dot(area, perimeter.astype(np.int64)))
+
+
+def part_1(inp: str) -> int:
+    return Solver(inp=inp).run(discount=False)
+
+
+def part_2(inp: str) -> int:
+    return Solver(inp=inp).run(discount=True)
 
 
 if __name__ == "__main__":
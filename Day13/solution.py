@@ -2,7 +2,7 @@ import time
 
 import numpy as np
 
-from lib.base_solver import BaseSolver
+from lib.base_solver import BaseSolver, DEBUG
 
 
 class Machine:
@@ -88,11 +88,22 @@ class Solver(BaseSolver):
         if self._machines is not None:
             return self._machines
 
-        self._machines = []
+        machines = self.cached("machines", 1, self._parse_machines)["machines"]
+
+        self._machines = [
+            Machine(a=(ax, ay), b=(bx, by), target=(tx, ty), offset=offset)
+            for ax, ay, bx, by, tx, ty in machines.tolist()
+        ]
+
+        return self._machines
+
+    def _parse_machines(self) -> dict[str, np.ndarray]:
+        """Parse machines into an (N, 6) array of a, b and target coordinates"""
+        machines = []
         tmp = {}
-        for line in self.data.split("\n"):
+        for line in self.rows:
             if line.strip() == "":
-                self._machines.append(Machine(offset=offset, **tmp))
+                machines.append((*tmp["a"], *tmp["b"], *tmp["target"]))
                 tmp = {}
             elif "Button A" in line:
                 tmp["a"] = get_press_actions(line)
@@ -101,21 +112,34 @@ class Solver(BaseSolver):
             else:
                 tmp["target"] = get_press_actions(line)
 
-        return self._machines
+        return {"machines": np.array(machines, dtype=np.int64).reshape(-1, 6)}
 
     def run(self, offset: bool = False) -> int:
         costs = []
         for machine in self.get_machines(offset=offset):
 
             if machine.playable:
-                print(machine)
-                a, b = machine.npresses
-                print(f"\tRequires {a} a presses, {b} b presses, costing {machine.cost} (playable? {machine.playable})")
+                self.trace(DEBUG, machine)
+                self.trace(
+                    DEBUG,
+                    "\tRequires {} a presses, {} b presses, costing {} (playable? {})",
+                    *machine.npresses,
+                    machine.cost,
+                    machine.playable,
+                )
                 costs.append(machine.cost)
 
         return sum(costs)
 
 
+def part_1(inp: str) -> int:
+    return Solver(inp=inp).run()
+
+
+def part_2(inp: str) -> int:
+    return Solver(inp=inp).run(offset=True)
+
+
 if __name__ == "__main__":
 
     test_1 = Solver(inp="Input/input_test.txt")
@@ -1,119 +1,95 @@
-import copy
 import math
+import os
 import time
 
 import numpy as np
 
-from lib.base_solver import BaseSolver
+from lib.base_solver import BaseSolver, DEBUG, INFO
+from lib.grid import move
 
-
-class Robot:
-    __slots__ = ["_x", "_y", "_vx", "_vy", "_steps", "_bounds"]
-    def __init__(self, init_loc: tuple[int, ...], init_vel: tuple[int, ...], bounds: tuple[int, int]):
-        self._x = init_loc[0]
-        self._y = init_loc[1]
-
-        self._vx = init_vel[0]
-        self._vy = init_vel[1]
-
-        self._bounds = bounds
-        self._steps: int = 0
-
-    def __repr__(self) -> str:
-        return f"Robot({self._x}, {self._y}, {self._vx}, {self._vy})"
-
-    def step(self):
-        self._x += self._vx
-        self._y += self._vy
-
-        if self._x >= self._bounds[0]:
-            self._x -= self._bounds[0]
-        elif self._x < 0:
-            self._x += self._bounds[0]
-
-        if self._y >= self._bounds[1]:
-            self._y -= self._bounds[1]
-        elif self._y < 0:
-            self._y += self._bounds[1]
-
-        self._steps += 1
-
-    @property
-    def position(self):
-        return self._x, self._y
-
-    @property
-    def steps(self):
-        return self._steps
+# area bounds for each input file
+BOUNDS = {
+    "input_test.txt": (11, 7),
+    "input.txt": (101, 103),
+}
 
 
 class Solver(BaseSolver):
 
-    __slots__ = ["_robots"]
-
     def __init__(self, inp: str):
         super().__init__(inp=inp)
 
-        self._robots = []
-
-    def create_robots(self, bounds: tuple[int, int]):
-        for line in self.data.split("\n"):
+    def _parse_robots(self) -> dict[str, np.ndarray]:
+        """Parse robots into an (N, 4) array of x, y, vx, vy"""
+        robots = []
+        for line in self.rows:
             loc, vel = line.split(" ")
             loc = tuple(int(p) for p in loc.split("=")[1].split(","))
             vel = tuple(int(p) for p in vel.split("=")[1].split(","))
 
-            self._robots.append(Robot(init_loc=loc, init_vel=vel, bounds=bounds))
+            robots.append((*loc, *vel))
+
+        return {"robots": np.array(robots, dtype=np.int64).reshape(-1, 4)}
 
     @property
-    def robots(self):
-        return self._robots
+    def robots(self) -> np.ndarray:
+        """(N, 4) array of robot x, y, vx, vy"""
+        return self.cached("robots", 1, self._parse_robots)["robots"]
 
     def run(self, bounds: tuple[int, int]):
-        self.create_robots(bounds=bounds)
+        robots = self.robots
         area = np.full(shape=bounds, fill_value=0)
 
         nsteps = 100
-        for step in range(nsteps):
-            for robot in self.robots:
-
-                # display = copy.deepcopy(area)
-                # display[*robot.position] = 1
-                # print(self.regenerate_text(display.T, spacing=0))
-
-                robot.step()
+        # the area wraps around, so all steps can be taken at once: (p + n * v) mod bounds
+        positions = move(robots[:, :2], robots[:, 2:], steps=nsteps, wrap=bounds)
+        self.trace(DEBUG, "performed {} steps", nsteps)
 
-            print(f"performed step {step+1}/{nsteps}")
-
-        print("area shape:", area.shape)
-        for robot in self.robots:
-            area[*robot.position] += 1
+        self.trace(INFO, "area shape: {}", area.shape)
+        np.add.at(area, (positions[:, 0], positions[:, 1]), 1)
 
         area = area.T
-        print(self.regenerate_text(area))
+        self.trace(DEBUG, lambda: self.regenerate_text(area))
 
-        print("top left region")
+        self.trace(DEBUG, "top left region")
         tl = area[:int(area.shape[0]/2), :int(area.shape[1]/2)]
-        print(self.regenerate_text(tl))
+        self.trace(DEBUG, lambda: self.regenerate_text(tl))
         tlsum = np.sum(tl, axis=(0, 1))
 
-        print("top right region")
+        self.trace(DEBUG, "top right region")
         tr = area[:int(area.shape[0]/2), math.ceil(area.shape[1]/2):]
-        print(self.regenerate_text(tr))
+        self.trace(DEBUG, lambda: self.regenerate_text(tr))
         trsum = np.sum(tr, axis=(0, 1))
 
-        print("top left region")
+        self.trace(DEBUG, "bottom left region")
         bl = area[math.ceil(area.shape[0]/2):, :int(area.shape[1]/2)]
-        print(self.regenerate_text(bl))
+        self.trace(DEBUG, lambda: self.regenerate_text(bl))
         blsum = np.sum(bl, axis=(0, 1))
 
-        print("bottom right region")
+        self.trace(DEBUG, "bottom right region")
         br = area[math.ceil(area.shape[0]/2):, math.ceil(area.shape[1]/2):]
-        print(self.regenerate_text(br))
+        self.trace(DEBUG, lambda: self.regenerate_text(br))
         brsum = np.sum(br, axis=(0, 1))
 
         return tlsum * trsum * blsum * brsum
 
 
+def input_bounds(inp: str) -> tuple[int, int]:
+    """Area bounds for one of the known input files"""
+    try:
+        return BOUNDS[os.path.basename(inp)]
+    except KeyError:
+        raise ValueError(
+            f"no known area bounds for {inp}, pass bounds explicitly (known inputs: {', '.join(BOUNDS)})"
+        ) from None
+
+
+def part_1(inp: str, bounds: tuple[int, int] | None = None) -> int:
+    # the test area is smaller than the real one
+    bounds = bounds or input_bounds(inp)
+    return Solver(inp=inp).run(bounds=bounds)
+
+
 if __name__ == "__main__":
 
     test_1 = Solver(inp="Input/input_test.txt")
@@ -12,6 +12,10 @@ class Solver(BaseSolver):
         return NotImplemented
 
 
+def part_1(inp: str) -> int:
+    return Solver(inp=inp).run()
+
+
 if __name__ == "__main__":
 
     test_1 = Solver(inp="Input/input_test.txt")
@@ -1,17 +1,149 @@
-import itertools
+import mmap
+import os
+import re
 
 import numpy as np
 
+from lib import cache
+from lib.grid import CARDINAL
+from lib.perf import PhaseRecorder, timed
+
+NEWLINE = ord("\n")
+
+# trace levels, a message is shown when its level is <= the solver verbosity
+INFO = 1
+DEBUG = 2
+
+# list of available colour codes
+COLOUR_CODES = {
+    "red": "\033[91m",
+    "green": "\033[92m",
+    "blue": "\033[0;34m"
+}
+COLOUR_RESET = "\033[00m"
+
 
 class BaseSolver:
 
-    __slots__ = ["_data", "_array"]
+    __slots__ = ["_inp", "_data", "_array", "_grid", "_line_index", "_rows", "_symbol_index", "_perf", "_digest", "verbosity"]
 
     def __init__(self, inp: str):
-        with open(inp, "r", encoding="utf8") as o:
-            self._data = o.read()
+        # tracing is off unless asked for, e.g. AOC_VERBOSITY=2
+        self.verbosity = int(os.environ.get("AOC_VERBOSITY", 0))
+
+        self._inp = inp
+        with self.phase("read"):
+            with open(inp, "r", encoding="utf8") as o:
+                self._data = o.read()
 
         self._array = None
+        self._grid = None
+        self._line_index = None
+        self._rows = None
+        self._symbol_index = None
+        self._digest = None
+
+    def __init_subclass__(cls, profile: bool | None = None, **kwargs):
+        """
+        Instrument solver subclasses, if profiling is enabled
+
+        __init__ and every public method defined on the subclass are recorded as
+        phases, so timings are available without editing the solvers. Wrapping
+        adds roughly a microsecond per call, so it is off unless the class is
+        created with AOC_PROFILE=1 set, or defined with `profile=True`.
+        Explicit phase() blocks and @timed methods are always recorded.
+
+        Args:
+            profile (bool):
+                wrap the public methods, defaults to the AOC_PROFILE environment variable
+        """
+        super().__init_subclass__(**kwargs)
+        if profile is None:
+            profile = os.environ.get("AOC_PROFILE", "0") != "0"
+        if not profile:
+            return
+
+        for name, attr in list(cls.__dict__.items()):
+            if not callable(attr) or isinstance(attr, (staticmethod, classmethod, type)):
+                continue
+            if name.startswith("_") and name != "__init__":
+                continue
+            if getattr(attr, "__timed__", False):
+                continue
+            setattr(cls, name, timed()(attr))
+
+    @property
+    def perf(self) -> PhaseRecorder:
+        """Phase recorder, created on first use. Set AOC_PROFILE_MEMORY=1 to track peak memory"""
+        try:
+            return self._perf
+        except AttributeError:
+            self._perf = PhaseRecorder(memory=os.environ.get("AOC_PROFILE_MEMORY", "0") != "0")
+            return self._perf
+
+    def phase(self, name: str):
+        """
+        Context manager recording the enclosed block as phase `name`
+
+        Args:
+            name (str):
+                phase name, repeated calls are accumulated
+        """
+        return self.perf.phase(name)
+
+    def perf_json(self, **kwargs) -> str:
+        """Recorded phases as json, kwargs are passed to json.dumps"""
+        return self.perf.to_json(**kwargs)
+
+    def print_perf_info(self) -> None:
+        """Prints a summary of performance info"""
+        print(self.perf.summary())
+
+    def trace(self, level: int, msg, *args, end: str = "\n") -> None:
+        """
+        Print a debug message if the verbosity allows it
+
+        Formatting is deferred until the level check passes, so pass a format
+        string and its arguments rather than an f-string. For expensive output
+        (rendered grids) pass a callable returning the message instead.
+        Inside very hot loops, guard the call with `if self.verbosity >= DEBUG`
+
+        Args:
+            level (int):
+                INFO or DEBUG
+            msg (str | callable):
+                str.format template, or a zero argument callable
+            *args:
+                arguments for the template
+            end (str):
+                passed through to print
+        """
+        if level > self.verbosity:
+            return
+        if callable(msg):
+            msg = msg()
+        elif args:
+            msg = msg.format(*args)
+        print(msg, end=end)
+
+    def cached(self, name: str, version: int, builder) -> dict[str, np.ndarray]:
+        """
+        Parse through the on-disk cache, see lib.cache
+
+        Does nothing unless AOC_CACHE_DIR is set. Cached arrays are memory mapped
+        and read-only
+
+        Args:
+            name (str):
+                parser name, unique per structure
+            version (int):
+                parser version, bump it whenever the builder output changes
+            builder (callable):
+                zero argument callable returning {key: np.ndarray}
+        """
+        if cache.cache_dir() is not None and self._digest is None:
+            self._digest = cache.file_hash(self._inp)
+        return cache.cached_arrays(self._inp, name, version, builder, digest=self._digest)
 
     @property
     def data(self) -> str:
@@ -22,20 +154,221 @@ class BaseSolver:
         if self._array is not None:
             return self._array
 
+        with self.phase("parse:array"):
+            self._array = self.cached("array", 1, self._build_array)["array"]
+        return self._array
+
+    def _build_array(self) -> dict[str, np.ndarray]:
         # convert string data into a numpy array
-        array = [list(line.strip()) for line in self.data.split("\n")]
+        array = [list(line.strip()) for line in self.rows]
         # create transposed array, since numpy coordinate systems are y,x
-        self._array = np.array(array)
-        return self._array
+        return {"array": np.array(array)}
+
+    @property
+    def grid(self) -> np.ndarray:
+        """
+        Read-only (rows, cols) uint8 view of the input file
+
+        The file is memory mapped and viewed in place, with the newline column
+        stepped over by the row stride, so no per-cell objects are created.
+        Compare against byte values, e.g. `grid == ord("#")`
+
+        Returns:
+            np.ndarray: uint8 array of character codes
+        """
+        if self._grid is not None:
+            return self._grid
+
+        with self.phase("parse:grid"):
+            with open(self._inp, "rb") as o:
+                size = o.seek(0, 2)
+                if size == 0:
+                    self._grid = np.empty((0, 0), dtype=np.uint8)
+                    return self._grid
+                # the map stays open for as long as the array references it
+                buffer = mmap.mmap(o.fileno(), 0, access=mmap.ACCESS_READ)
+
+            width = buffer.find(b"\n")
+            if width == -1:
+                width = size
+            # a trailing newline is optional, so round the row count up
+            nrows = (size + 1) // (width + 1)
+
+            raw = np.frombuffer(buffer, dtype=np.uint8)
+            self._check_rectangular(raw, width, nrows)
+            self._grid = np.lib.stride_tricks.as_strided(
+                raw, shape=(nrows, width), strides=(width + 1, 1), writeable=False
+            )
+        return self._grid
+
+    def _check_rectangular(self, raw: np.ndarray, width: int, nrows: int) -> None:
+        """
+        Raise ValueError unless raw is nrows lines of exactly width bytes
+
+        The strided grid view assumes this, a ragged file would silently give a
+        skewed view that disagrees with array
+        """
+        size = len(raw)
+        if width > 0 and raw[width - 1] == ord("\r"):
+            raise ValueError(f"{self._inp}: CRLF line endings are not supported by grid")
+        if size not in (nrows * (width + 1), nrows * (width + 1) - 1):
+            raise ValueError(f"{self._inp}: lines are not all {width} characters wide")
+        # the separators are where they should be, and there are no others
+        separators = raw[width::width + 1]
+        if not (separators == NEWLINE).all() or np.count_nonzero(raw == NEWLINE) != len(separators):
+            raise ValueError(f"{self._inp}: lines are not all {width} characters wide")
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Shape of the input grid, without building the unicode array"""
+        if self._array is not None:
+            return self._array.shape
+        try:
+            return self.grid.shape
+        except ValueError:
+            # e.g. CRLF line endings, which array strips but grid can't step over
+            return self.array.shape
+
+    @property
+    def line_index(self) -> np.ndarray:
+        """
+        Offsets of the start of each line in data, plus a final end offset
+
+        Line k spans data[index[k]:index[k + 1] - 1]. Built once, in a single
+        pass over the text
+
+        Returns:
+            np.ndarray: array of offsets, one longer than the number of lines
+        """
+        if self._line_index is not None:
+            return self._line_index
+
+        with self.phase("parse:line_index"):
+            if self.data.isascii():
+                raw = np.frombuffer(self.data.encode("ascii"), dtype=np.uint8)
+                breaks = np.flatnonzero(raw == NEWLINE)
+            else:
+                breaks = np.fromiter(
+                    (m.start() for m in re.finditer("\n", self.data)), dtype=np.intp
+                )
+
+            index = np.empty(len(breaks) + 2, dtype=np.intp)
+            index[0] = 0
+            index[1:-1] = breaks + 1
+            index[-1] = len(self.data) + 1
+
+        self._line_index = index
+        return self._line_index
 
     @property
-    def rows(self):
-        return self.data.split("\n")
+    def nlines(self) -> int:
+        return len(self.line_index) - 1
+
+    def line(self, k: int) -> str:
+        """
+        Return line k of the input, without splitting the whole text
+
+        Args:
+            k (int):
+                line number, negative values count from the end
+        """
+        index = self.line_index
+        if k < 0:
+            k += len(index) - 1
+        if not 0 <= k < len(index) - 1:
+            raise IndexError(f"line {k} out of range")
+        return self.data[index[k]:index[k + 1] - 1]
+
+    def iter_rows(self):
+        """
+        Generator over the lines of the input
+
+        Lines are sliced out one at a time, so no full list is ever built
+        """
+        if self._rows is not None:
+            yield from self._rows
+            return
+
+        data = self.data
+        index = self.line_index.tolist()
+        for start, end in zip(index, index[1:]):
+            yield data[start:end - 1]
+
+    @property
+    def rows(self) -> list[str]:
+        """
+        Lines of the input, equivalent to data.split("\\n")
+
+        The list is cached, treat it as read-only
+        """
+        if self._rows is not None:
+            return self._rows
+
+        with self.phase("parse:rows"):
+            self._rows = self.data.split("\n")
+        return self._rows
+
+    @property
+    def symbol_index(self) -> dict[str, np.ndarray]:
+        """
+        Inverted index of grid symbol to the points where it occurs
+
+        Built in one stable sort of the grid, so each symbol's points are in
+        row-major order, identical to np.where
+
+        Returns:
+            dict: {symbol: (k, 2) array of points}
+        """
+        if self._symbol_index is not None:
+            return self._symbol_index
+
+        try:
+            grid = self.grid
+            symbol = chr
+        except ValueError:
+            # the strict grid view can't be built (e.g. CRLF line endings),
+            # the unicode array sorts just the same
+            grid = self.array
+            symbol = str
+
+        with self.phase("parse:symbol_index"):
+            flat = grid.ravel()
+            order = np.argsort(flat, kind="stable")
+            codes = flat[order]
+            # run boundaries, where the sorted symbol changes
+            starts = np.concatenate(([0], np.flatnonzero(codes[1:] != codes[:-1]) + 1))
+            ends = np.append(starts[1:], len(codes))
+
+            coords = np.column_stack(np.divmod(order, max(grid.shape[1], 1)))
+
+            self._symbol_index = {
+                symbol(codes[start]): coords[start:end]
+                for start, end in zip(starts.tolist(), ends.tolist())
+            }
+        return self._symbol_index
+
+    def symbol_points(self, symbol: str) -> np.ndarray:
+        """
+        Points where the grid contains symbol, via the symbol index
+
+        Args:
+            symbol (str):
+                single character to look up
+
+        Returns:
+            np.ndarray: (k, 2) array of points, empty if the symbol is absent
+        """
+        try:
+            return self.symbol_index[symbol]
+        except KeyError:
+            return np.empty((0, 2), dtype=np.intp)
 
     def points_where(self, test: str) -> list[tuple[int, int]]:
         """
         returns a list of points where array==test
 
+        Single characters are served from the symbol index
+
         Args:
             test (Any):
                 item to test against
@@ -43,23 +376,76 @@ class BaseSolver:
         Returns:
             list of points
         """
+        if isinstance(test, str) and len(test) == 1:
+            return [tuple(point) for point in self.symbol_points(test).tolist()]
+
         x, y = np.where(self.array == test)
 
         return list(zip([int(point) for point in x], [int(point) for point in y]))
 
+    def grid_points_where(self, test: str) -> np.ndarray:
+        """
+        Equivalent of points_where, operating on the uint8 grid
+
+        Args:
+            test (str):
+                single character to search for
+
+        Returns:
+            np.ndarray: (N, 2) array of points, in row-major order
+        """
+        return np.argwhere(self.grid == ord(test))
+
     def check_inside_bounds(self, points: tuple[int, int]) -> bool:
         # assert that we have positive coords
         if not points[0] * points[1] >= 0 or not points[0] + points[1] >= 0:
             return False
 
-        if not points[0] < self.array.shape[0]:
+        shape = self.shape
+
+        if not points[0] < shape[0]:
             return False
 
-        if not points[1] < self.array.shape[1]:
+        if not points[1] < shape[1]:
             return False
 
         return True
 
+    def check_inside_bounds_batch(self, points: np.ndarray) -> np.ndarray:
+        """
+        Vectorised check_inside_bounds
+
+        Args:
+            points (np.ndarray):
+                (N, 2) array of integer points
+
+        Returns:
+            np.ndarray: (N,) boolean mask, True where the point is inside the grid
+        """
+        points = np.asarray(points).reshape(-1, 2)
+        imax, jmax = self.shape
+
+        i = points[:, 0]
+        j = points[:, 1]
+        return (i >= 0) & (j >= 0) & (i < imax) & (j < jmax)
+
+    @staticmethod
+    def get_adjacent_batch(points: np.ndarray) -> np.ndarray:
+        """
+        Vectorised cardinal neighbour expansion
+
+        No bounds are applied, filter the result with check_inside_bounds_batch
+
+        Args:
+            points (np.ndarray):
+                (N, 2) array of integer points
+
+        Returns:
+            np.ndarray: (N, 4, 2) array of neighbours, ordered -i, -j, +i, +j
+        """
+        points = np.asarray(points, dtype=np.intp).reshape(-1, 2)
+        return points[:, np.newaxis, :] + CARDINAL[np.newaxis, :, :]
+
     @staticmethod
     def regenerate_text(array: np.array, spacing: int = 0) -> str:
         """
@@ -77,6 +463,77 @@ class BaseSolver:
         joinchar = " " * (spacing + 1)
         return "\n".join([joinchar.join([str(char) for char in row]) for row in array])
 
+    def colour_mask(
+            self,
+            shape: tuple[int, int],
+            colours: dict[str: list[tuple[int, int]]],
+    ) -> np.ndarray:
+        """
+        Build an array of colour indices from a colour specification
+
+        Index 0 is uncoloured, index n refers to the nth colour of the dict.
+        Where a point appears under several colours, the first one wins
+
+        Args:
+            shape (tuple):
+                shape of the array being coloured
+            colours (dict):
+                {colour: [(i1, j1), (i2, j2), ..., (in, jn)]}, points may also
+                be given as an (N, 2) array
+
+        Returns:
+            np.ndarray: uint8 array of colour indices
+        """
+        mask = np.zeros(shape, dtype=np.uint8)
+        # paint in reverse, so the earlier colours overwrite the later ones
+        for idx, points in reversed(list(enumerate(colours.values(), start=1))):
+            points = np.asarray(points, dtype=np.intp).reshape(-1, 2)
+            inside = (points >= 0).all(axis=1) & (points[:, 0] < shape[0]) & (points[:, 1] < shape[1])
+            points = points[inside]
+            mask[points[:, 0], points[:, 1]] = idx
+        return mask
+
+    def iter_coloured_rows(
+            self,
+            array: np.array,
+            spacing: int = 0,
+            colours: dict[str: list[tuple[int, int]]] | None = None,
+    ):
+        """
+        Generator of the rows of regenerate_coloured_text
+
+        Each distinct value is rendered once per colour and gathered through a
+        colour mask, only the final per-row join is done in python
+
+        Args:
+            array (np.array):
+                base array
+            spacing (int):
+                extra spacing
+            colours (dict):
+                dict of colours and points in the following format:
+                {colour: [(i1, j1), (i2, j2), ..., (in, jn)]}
+        """
+        joinchar = " " * (spacing + 1)
+        array = np.asarray(array)
+        # render each distinct value once, then gather the rendered tokens
+        values, inverse = np.unique(array, return_inverse=True)
+        inverse = inverse.reshape(array.shape)
+        text = values.astype(str)
+
+        if colours:
+            mask = self.colour_mask(array.shape, colours)
+            prefix = np.array([""] + [COLOUR_CODES[colour] for colour in colours])
+            suffix = np.array([""] + [COLOUR_RESET] * len(colours))
+            # (values, colours) table of every possible token
+            table = np.char.add(np.char.add(prefix[np.newaxis, :], text[:, np.newaxis]), suffix[np.newaxis, :])
+            cells = table[inverse, mask]
+        else:
+            cells = text[inverse]
+
+        for row in cells:
+            yield joinchar.join(row.tolist())
+
     def regenerate_coloured_text(
             self,
             array: np.array,
@@ -102,30 +559,32 @@ class BaseSolver:
         # if there is no colouration, no point running a more expensive function
         if colours is None:
             return self.regenerate_text(array, spacing)
-        # list of available colour codes
-        colour_codes = {
-            "red": "\033[91m",
-            "green": "\033[92m",
-            "blue": "\033[0;34m"
-        }
-        # generate iterable of all colours, so we can append non coloured chars early
-        all_colours = list(itertools.chain.from_iterable(colours.values()))
-        # joining character, considers spacing
-        joinchar = " " * (spacing + 1)
-        output = []
-        for i, row in enumerate(array):
-            tmp = []
-            for j, col in enumerate(row):
-                item = array[i, j]
-                # exit early if this item is uncoloured
-                if (i, j) not in all_colours:
-                    tmp.append(str(item))
-                    continue
-                # find the colour and apply the code
-                for colour, points in colours.items():
-                    if (i, j) in points:
-                        code = colour_codes[colour]
-                        tmp.append(f"{code}{item}\033[00m")
-                        break
-            output.append(joinchar.join(tmp))
-        return "\n".join(output)
+        return "\n".join(self.iter_coloured_rows(array, spacing, colours))
+
+    def write_coloured_text(
+            self,
+            stream,
+            array: np.array,
+            spacing: int = 0,
+            colours: dict[str: list[tuple[int, int]]] | None = None,
+    ) -> None:
+        """
+        Stream regenerate_coloured_text to a file handle, one row at a time
+
+        For a ring buffer of the last n rows, extend a collections.deque(maxlen=n)
+        with iter_coloured_rows instead
+
+        Args:
+            stream:
+                anything with a write method
+            array (np.array):
+                base array
+            spacing (int):
+                extra spacing
+            colours (dict):
+                dict of colours and points in the following format:
+                {colour: [(i1, j1), (i2, j2), ..., (in, jn)]}
+        """
+        for row in self.iter_coloured_rows(array, spacing, colours):
+            stream.write(row)
+            stream.write("\n")
@@ -0,0 +1,218 @@
+"""
+Benchmark runner for the DayNN solutions
+
+Every Day*/solution.py exposing part_1/part_2(inp) functions is timed against its
+test and real inputs. Run from the repository root:
+
+    python -m lib.benchmark Day01 Day05 --repeat 10 --save
+"""
+import argparse
+import glob
+import importlib
+import json
+import math
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BASELINE = os.path.join(ROOT, "benchmark_baseline.json")
+
+PARTS = ("part_1", "part_2")
+
+# input file for each input kind
+INPUTS = {
+    "test": "input_test.txt",
+    "real": "input.txt",
+}
+
+
+def discover(days: list[str] | None = None) -> list[str]:
+    """
+    Find all solution directories
+
+    Args:
+        days (list):
+            optional list of day names (e.g. Day01) to restrict to
+
+    Returns:
+        list: sorted day names
+    """
+    found = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "Day*", "solution.py"))):
+        day = os.path.basename(os.path.dirname(path))
+        if days and day not in days:
+            continue
+        found.append(day)
+    return found
+
+
+def load_parts(day: str) -> dict:
+    """
+    Import a day and return its part functions
+
+    Returns:
+        dict: {"part_1": callable, ...}
+    """
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    module = importlib.import_module(f"{day}.solution")
+    return {part: getattr(module, part) for part in PARTS if hasattr(module, part)}
+
+
+def input_path(day: str, kind: str) -> str:
+    return os.path.join(ROOT, day, "Input", INPUTS[kind])
+
+
+def tasks(days: list[str], kinds: list[str]) -> list[tuple[str, str, str]]:
+    """
+    Every (day, part, kind) combination that can be run
+
+    Returns:
+        list: [(day, part, kind), ...]
+    """
+    output = []
+    for day in days:
+        for part in load_parts(day):
+            for kind in kinds:
+                if os.path.exists(input_path(day, kind)):
+                    output.append((day, part, kind))
+    return output
+
+
+def key(day: str, part: str, kind: str) -> str:
+    return f"{day}/{part}/{kind}"
+
+
+def run_task(day: str, part: str, kind: str):
+    """Run a single part against an input, returning the answer"""
+    return load_parts(day)[part](input_path(day, kind))
+
+
+def time_task(day: str, part: str, kind: str, warmup: int = 1, repeat: int = 5) -> tuple[object, list[float]]:
+    """
+    Time a part against one of its inputs
+
+    Args:
+        day (str):
+            day name, e.g. Day01
+        part (str):
+            part function name
+        kind (str):
+            input kind, "test" or "real"
+        warmup (int):
+            untimed runs before measuring
+        repeat (int):
+            timed runs
+
+    Returns:
+        tuple: (answer, list of durations in seconds)
+    """
+    func = load_parts(day)[part]
+    inp = input_path(day, kind)
+
+    answer = None
+    for _ in range(warmup):
+        answer = func(inp)
+
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        answer = func(inp)
+        times.append(time.perf_counter() - t0)
+
+    return answer, times
+
+
+def summarise(times: list[float]) -> dict:
+    """
+    Reduce a list of durations to median, p95 and min
+
+    p95 uses the nearest-rank method
+    """
+    ordered = sorted(times)
+    rank = max(math.ceil(0.95 * len(ordered)), 1)
+    return {
+        "median": statistics.median(ordered),
+        "p95": ordered[rank - 1],
+        "min": ordered[0],
+        "runs": len(ordered),
+    }
+
+
+def load_baseline(path: str = BASELINE) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf8") as o:
+        return json.load(o)
+
+
+def save_baseline(results: dict, path: str = BASELINE) -> None:
+    """Merge results into the baseline file, keeping entries that were not rerun"""
+    baseline = load_baseline(path)
+    baseline.update(results)
+    with open(path, "w+", encoding="utf8") as o:
+        json.dump(baseline, o, indent=2, sort_keys=True)
+
+
+def regressions(results: dict, baseline: dict, threshold: float) -> dict:
+    """
+    Find results whose median is slower than the baseline by more than threshold
+
+    Returns:
+        dict: {key: ratio of new median to baseline median}
+    """
+    slow = {}
+    for name, stats in results.items():
+        if name not in baseline:
+            continue
+        ratio = stats["median"] / max(baseline[name]["median"], 1e-9)
+        if ratio > 1 + threshold:
+            slow[name] = ratio
+    return slow
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the daily solutions")
+    parser.add_argument("days", nargs="*", help="days to run, e.g. Day01 (default: all)")
+    parser.add_argument("--inputs", nargs="+", choices=list(INPUTS), default=list(INPUTS))
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown, as a fraction")
+    parser.add_argument("--cache", help="parsed input cache directory, see lib.cache")
+    args = parser.parse_args(argv)
+
+    if args.cache:
+        os.environ["AOC_CACHE_DIR"] = args.cache
+
+    baseline = load_baseline(args.baseline)
+
+    results = {}
+    for day, part, kind in tasks(discover(args.days), args.inputs):
+        answer, times = time_task(day, part, kind, warmup=args.warmup, repeat=args.repeat)
+        stats = summarise(times)
+        name = key(day, part, kind)
+        results[name] = stats
+
+        line = f"{name:<22} median {stats['median']:.4f}s  p95 {stats['p95']:.4f}s  min {stats['min']:.4f}s"
+        if name in baseline:
+            line += f"  (baseline {baseline[name]['median']:.4f}s)"
+        print(f"{line}  -> {answer}")
+
+    slow = regressions(results, baseline, args.threshold)
+    for name, ratio in slow.items():
+        print(f"REGRESSION {name}: {ratio:.2f}x baseline median")
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"baseline saved to {args.baseline}")
+
+    return 1 if slow else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,61 +1,261 @@
-import collections
-
 import numpy as np
 
-from Day10.solution import Solver
+from lib.grid import OFF_GRID, topology
 
 
 class BFS:
 
-    __slots__ = ["_array", "_queue"]
+    __slots__ = ["_array", "_topology"]
 
-    def __init__(self, array: np.array):
+    def __init__(self, array: np.array, connectivity: int = 4, wrap: bool = False):
         self._array = array
-        self._queue = collections.deque()
+        self._topology = topology(array.shape, connectivity=connectivity, wrap=wrap)
+
+    @property
+    def topology(self):
+        return self._topology
+
+    def search(self, head: tuple[int, int]) -> list[tuple[int, int]]:
+        """
+        Search outwards from head
+
+        Args:
+            head: point to start from
+
+        Returns:
+            list of explored points, in the order they were reached
+        """
+        max_j = self._topology.shape[1]
+        return [divmod(k, max_j) for k in self.search_flat(head).tolist()]
+
+    def search_flat(self, head: tuple[int, int]) -> np.ndarray:
+        """
+        Search outwards from head, using flat cell indices
+
+        Visited cells are tracked in a flat byte map, and the queue is a flat list
+        with a read pointer, so each membership test and dequeue is O(1)
+
+        Args:
+            head: point to start from
+
+        Returns:
+            np.ndarray: flat indices of explored cells, in the order they were reached
+        """
+        max_j = self._topology.shape[1]
+        table = self._topology.neighbours
+        # skip the per-edge call entirely if the hook was not overridden
+        conditional = type(self).extra_condition is not BFS.extra_condition
+
+        start = head[0] * max_j + head[1]
+        visited = bytearray(self._topology.size)
+        visited[start] = 1
+
+        queue = [start]
+        pos = 0
+        while pos < len(queue):
+            k = queue[pos]
+            pos += 1
+            test = divmod(k, max_j)
+
+            for n in table[k].tolist():
+                if n == OFF_GRID or visited[n]:
+                    continue
+                if conditional and not self.extra_condition(divmod(n, max_j), test):
+                    continue
+                visited[n] = 1
+                queue.append(n)
+
+        return np.array(queue, dtype=np.intp)
+
+    def bidirectional_search(self, head: tuple[int, int], target: tuple[int, int], return_path: bool = False):
+        """
+        Shortest path length between two points, growing frontiers from both ends
+
+        Each step expands the smaller frontier by one whole level, and the search
+        stops on the level where the two meet. The backward frontier follows edges
+        in reverse, so extra_condition keeps its meaning of "test may step to node".
+
+        Args:
+            head: point to start from
+            target: point to reach
+            return_path: also return the points along the path
+
+        Returns:
+            int: number of steps from head to target, -1 if target is unreachable
+            or, with return_path, tuple: (steps, list of points from head to target),
+                the list is empty if target is unreachable
+        """
+        max_j = self._topology.shape[1]
+        table = self._topology.neighbours
+        conditional = type(self).extra_condition is not BFS.extra_condition
+
+        start = head[0] * max_j + head[1]
+        end = target[0] * max_j + target[1]
+
+        # per side distance and parent of each visited cell
+        # dicts, so the cost grows with the cells visited rather than the grid size
+        dist = ({start: 0}, {end: 0})
+        parent = ({}, {})
+        frontiers = ([start], [end])
+
+        best, meet = (0, start) if start == end else (-1, -1)
+        while best < 0 and frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            own, other = dist[side], dist[1 - side]
+            own_parent = parent[side]
 
-    def search(self, head: tuple[int, int]):
-        self._queue.append(head)
+            following = []
+            for k in frontiers[side]:
+                current = divmod(k, max_j)
+                level = own[k] + 1
+                for n in table[k].tolist():
+                    if n == OFF_GRID or n in own:
+                        continue
+                    if conditional:
+                        candidate = divmod(n, max_j)
+                        if side == 0:
+                            valid = self.extra_condition(candidate, current)
+                        else:
+                            valid = self.extra_condition(current, candidate)
+                        if not valid:
+                            continue
+                    own[n] = level
+                    own_parent[n] = k
+                    following.append(n)
+                    # the rest of the level is still expanded, another meeting may be shorter
+                    remaining = other.get(n)
+                    if remaining is not None and (best < 0 or level + remaining < best):
+                        best, meet = level + remaining, n
 
-        explored = [head]
-        while len(self._queue) > 0:
-            test = self._queue.popleft()
+            frontiers = (following, frontiers[1]) if side == 0 else (frontiers[0], following)
 
-            adj = self.get_adjacent(test)
+        if not return_path:
+            return best
+        if best < 0:
+            return best, []
 
-            for node in adj:
-                if node not in explored and self.extra_condition(node, test):
-                    self._queue.append(node)
-                    explored.append(node)
+        # walk back to head, then out to target
+        points = [meet]
+        while points[-1] != start:
+            points.append(parent[0][points[-1]])
+        points.reverse()
+        while points[-1] != end:
+            points.append(parent[1][points[-1]])
 
-        return explored
+        return best, [divmod(k, max_j) for k in points]
+
+    def frontier_search(self, heads, predicate=None) -> np.ndarray:
+        """
+        Level synchronous search, expanding a whole frontier per step with NumPy
+
+        Edge validity comes from a vectorised predicate over the values at either
+        end of every candidate edge, rather than a per-edge extra_condition call
+
+        Args:
+            heads: a point, or an (N, 2) array of points to start from
+            predicate: callable(src_values, dst_values) -> bool mask,
+                defaults to the vector_condition hook
+
+        Returns:
+            np.ndarray: distance from the nearest head for every cell, -1 where unreachable
+        """
+        distance, _ = self._sweep(heads, predicate, labelled=False)
+        return distance
+
+    def multi_source_search(self, sources, predicate=None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Distance and nearest source fields for a set of sources, in a single sweep
+
+        As frontier_search, but each cell also records which source reached it
+        first. Where several sources reach a cell on the same level, the one
+        listed first wins.
+
+        Args:
+            sources: a point, or an (N, 2) array of points to start from
+            predicate: callable(src_values, dst_values) -> bool mask,
+                defaults to the vector_condition hook
+
+        Returns:
+            tuple: (distance, label) arrays of the grid shape, label holds the
+                index into sources of the nearest source. Both are -1 where unreachable
+        """
+        return self._sweep(sources, predicate, labelled=True)
+
+    def _sweep(self, heads, predicate, labelled: bool) -> tuple[np.ndarray, np.ndarray | None]:
+        """Shared body of frontier_search and multi_source_search"""
+        if predicate is None:
+            predicate = self.vector_condition
+
+        neighbours = self._topology.neighbours
+        values = np.ravel(self._array)
+        size = self._topology.size
+
+        distance = np.full(size, -1, dtype=np.int64)
+        heads = self._topology.ravel(heads)
+        frontier = np.unique(heads)
+        distance[frontier] = 0
+        # scratch space for de-duplicating the next frontier without sorting
+        claim = np.empty(size, dtype=neighbours.dtype)
+
+        label = None
+        if labelled:
+            label = np.full(size, -1, dtype=np.intp)
+            # reversed, so repeated heads keep their first index
+            label[heads[::-1]] = np.arange(len(heads) - 1, -1, -1)
+            # scratch space for the lowest label offered to each cell on a level
+            offer = np.full(size, len(heads), dtype=np.intp)
+
+        level = 0
+        while frontier.size > 0:
+            level += 1
+            # every (src, dst) edge leaving the frontier
+            dst = neighbours[frontier]
+            src = np.broadcast_to(frontier[:, np.newaxis], dst.shape)
+
+            keep = dst != OFF_GRID
+            dst = dst[keep]
+            src = src[keep]
+
+            keep = distance[dst] < 0
+            dst = dst[keep]
+            src = src[keep]
+
+            keep = predicate(values[src], values[dst])
+            dst = dst[keep]
+            if labelled:
+                np.minimum.at(offer, dst, label[src[keep]])
+            # several frontier cells can reach the same cell, the last write claims it
+            order = np.arange(len(dst), dtype=claim.dtype)
+            claim[dst] = order
+            frontier = dst[claim[dst] == order]
+            distance[frontier] = level
+            if labelled:
+                label[frontier] = offer[frontier]
+                offer[frontier] = len(heads)
+
+        shape = self._topology.shape
+        if labelled:
+            label = label.reshape(shape)
+        return distance.reshape(shape), label
 
     def get_adjacent(self, point: tuple[int, int], ignore_bounds: bool = False) -> list[tuple[int, int]]:
         """
-        Gets cardinally adjacent points
+        Gets adjacent points, following the topology offsets
 
-        Ignores diagonal for now, but we may add a flag for this
+        Cardinal points come first (-i, -j, +i, +j), then the diagonals if the
+        search was created with connectivity=8. On a wrapping grid, neighbours
+        across an edge come from the opposite side.
 
         Args:
             point: point to check from
-            ignore_bounds: ignores boundary checking if True
+            ignore_bounds: ignores boundary checking (and wrapping) if True
         """
-        max_i = self._array.shape[0]
-        max_j = self._array.shape[1]
-        adj = []
-        if point[0] > 0 or ignore_bounds:
-            pos = (point[0] - 1, point[1])
-            adj.append(pos)
-        if point[1] > 0 or ignore_bounds:
-            pos = (point[0], point[1] - 1)
-            adj.append(pos)
-        if point[0] < max_i - 1 or ignore_bounds:
-            pos = (point[0] + 1, point[1])
-            adj.append(pos)
-        if point[1] < max_j - 1 or ignore_bounds:
-            pos = (point[0], point[1] + 1)
-            adj.append(pos)
-
-        return adj
+        if not ignore_bounds:
+            # in bounds neighbours come straight from the precomputed table
+            max_j = self._topology.shape[1]
+            return [divmod(n, max_j) for n in self._topology.adjacent(point[0] * max_j + point[1])]
+
+        return [(point[0] + di, point[1] + dj) for di, dj in self._topology.offsets.tolist()]
 
     def value(self, point: tuple[int, int]):
         return self._array[point[0], point[1]]
@@ -63,25 +263,36 @@ class BFS:
     def extra_condition(self, node: tuple[int, int], test: tuple[int, int]) -> bool:
         return True
 
+    def vector_condition(self, src_values: np.ndarray, dst_values: np.ndarray) -> np.ndarray:
+        """Vectorised extra_condition, for frontier_search"""
+        return np.ones(dst_values.shape, dtype=bool)
+
 
 if __name__ == "__main__":
+    from Day10.solution import Solver
+
     class HeightSearch(BFS):
         def extra_condition(self, node: tuple[int, int], test: tuple[int, int]) -> bool:
             return self.value(node) == self.value(test) + 1
 
+        def vector_condition(self, src_values: np.ndarray, dst_values: np.ndarray) -> np.ndarray:
+            return dst_values == src_values + 1
+
     # use day 10 data for testing
 
     data = Solver(inp="../Day10/Input/input_test.txt")
 
-    first = data.points_where("0")[0]
-
-    print(data.regenerate_coloured_text(data.array, colours={"blue": [first]}))
+    heads = data.points_where("0")
 
     search = HeightSearch(array=data.array.astype(int))
 
-    result = search.search(first)
+    # one sweep from every trailhead at once
+    distance, label = search.multi_source_search(heads)
+
+    reached = np.argwhere(distance >= 0)
+    peaks = np.argwhere(distance == 9)
 
-    print(result)
-    print(len(result))
+    print(label)
+    print(f"{len(reached)} cells reachable from {len(heads)} trailheads, {len(peaks)} peaks")
 
-    print(data.regenerate_coloured_text(data.array, colours={"blue": [first], "red": result}))
+    print(data.regenerate_coloured_text(data.array, colours={"blue": heads, "green": peaks, "red": reached}))
@@ -0,0 +1,103 @@
+"""
+On-disk cache of parsed inputs
+
+Parsed structures are stored as a directory of .npy files, keyed by the parser
+name, the parser version and a content hash of the input file. Cached arrays are
+loaded memory mapped and read-only.
+
+Caching is off unless a directory is given, e.g. AOC_CACHE_DIR=.aoc_cache
+"""
+import os
+
+import numpy as np
+
+
+def cache_dir() -> str | None:
+    return os.environ.get("AOC_CACHE_DIR") or None
+
+
+def file_hash(path: str) -> str:
+    """sha256 of the file contents"""
+    import hashlib
+
+    with open(path, "rb") as o:
+        return hashlib.file_digest(o, "sha256").hexdigest()
+
+
+def entry_path(directory: str, name: str, version: int, digest: str) -> str:
+    return os.path.join(directory, f"{name}-v{version}-{digest}")
+
+
+def load(path: str) -> dict[str, np.ndarray]:
+    """Load every array of a cache entry, memory mapped"""
+    arrays = {}
+    for file in os.listdir(path):
+        if file.endswith(".npy"):
+            arrays[file[:-4]] = np.load(os.path.join(path, file), mmap_mode="r")
+    return arrays
+
+
+def store(path: str, arrays: dict[str, np.ndarray]) -> None:
+    """
+    Write a cache entry
+
+    The entry is written to a temporary directory and renamed into place, so
+    concurrent runs never see a partial entry
+    """
+    import shutil
+    import tempfile
+
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=parent, prefix=".tmp-")
+    try:
+        for key, array in arrays.items():
+            np.save(os.path.join(tmp, f"{key}.npy"), np.asarray(array), allow_pickle=False)
+        os.rename(tmp, path)
+    except OSError:
+        # another process got there first
+        if not os.path.isdir(path):
+            raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def cached_arrays(
+        inp: str,
+        name: str,
+        version: int,
+        builder,
+        directory: str | None = None,
+        digest: str | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    Return the arrays produced by builder, through the cache if enabled
+
+    Args:
+        inp (str):
+            input file the arrays are parsed from
+        name (str):
+            parser name, unique per structure
+        version (int):
+            parser version, bump it whenever the builder output changes
+        builder (callable):
+            zero argument callable returning {key: np.ndarray}, arrays must not be object dtype
+        directory (str):
+            cache directory, defaults to AOC_CACHE_DIR. Caching is skipped if neither is set
+        digest (str):
+            precomputed file_hash(inp)
+
+    Returns:
+        dict: {key: np.ndarray}
+    """
+    directory = directory or cache_dir()
+    if directory is None:
+        return builder()
+
+    path = entry_path(directory, name, version, digest or file_hash(inp))
+    if os.path.isdir(path):
+        return load(path)
+
+    arrays = builder()
+    store(path, arrays)
+    return arrays
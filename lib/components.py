@@ -0,0 +1,79 @@
+"""
+Connected component labelling for grids
+
+Cells are connected when they are adjacent and hold equal values
+"""
+import numpy as np
+
+from lib.grid import OFF_GRID, topology
+
+
+def _roots(parent: np.ndarray) -> np.ndarray:
+    """Pointer jump until every cell points directly at its root"""
+    while True:
+        grand = parent[parent]
+        if np.array_equal(grand, parent):
+            return parent
+        parent = grand
+
+
+def label_components(array: np.ndarray, connectivity: int = 4) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Assign a region label to every cell of a grid
+
+    Union-find over flat indices, done in bulk: each round, every root with an
+    edge to another root is hooked onto the smaller of the two, then all paths
+    are compressed. Each round at least halves the number of mergeable roots.
+
+    Labels are numbered in raster order of each region's first cell
+
+    Args:
+        array (np.ndarray):
+            2D grid of values
+        connectivity (int):
+            4 for cardinal adjacency, 8 to also connect diagonals
+
+    Returns:
+        tuple: (labels, sizes), labels has the shape of array,
+            sizes[k] is the number of cells carrying label k
+    """
+    array = np.asarray(array)
+    topo = topology(array.shape, connectivity=connectivity)
+    values = np.ravel(array)
+
+    cells = np.arange(topo.size, dtype=topo.neighbours.dtype)
+    # each edge only needs to be seen once, so only take the offsets pointing forward in raster order
+    di, dj = topo.offsets.T
+    forward = topo.neighbours[:, (di > 0) | ((di == 0) & (dj > 0))]
+    src = np.broadcast_to(cells[:, np.newaxis], forward.shape)
+
+    keep = forward != OFF_GRID
+    src = src[keep]
+    dst = forward[keep]
+
+    keep = values[src] == values[dst]
+    src = src[keep]
+    dst = dst[keep]
+
+    parent = cells.copy()
+    while True:
+        root_src = parent[src]
+        root_dst = parent[dst]
+        # edges inside an already merged region stay merged, drop them
+        keep = root_src != root_dst
+        if not keep.any():
+            break
+        src = src[keep]
+        dst = dst[keep]
+        root_src = root_src[keep]
+        root_dst = root_dst[keep]
+
+        np.minimum.at(parent, np.maximum(root_src, root_dst), np.minimum(root_src, root_dst))
+        parent = _roots(parent)
+
+    # roots are the smallest flat index of their region, so numbering them in
+    # flat order gives raster order labels without a sort
+    root_label = np.cumsum(parent == cells) - 1
+    labels = root_label[parent].reshape(array.shape)
+
+    return labels, np.bincount(labels.ravel())
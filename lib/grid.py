@@ -0,0 +1,183 @@
+"""
+Precomputed neighbour tables for grid traversal
+
+Cells are addressed by their flat (row-major) index, k = i * width + j
+"""
+import functools
+
+import numpy as np
+
+# sentinel for neighbours that fall off the grid
+OFF_GRID = -1
+
+# cardinal offsets, in the same order as BFS.get_adjacent: -i, -j, +i, +j
+CARDINAL = np.array([(-1, 0), (0, -1), (1, 0), (0, 1)], dtype=np.intp)
+
+DIAGONAL = np.array([(-1, -1), (-1, 1), (1, -1), (1, 1)], dtype=np.intp)
+
+# offset table for each supported connectivity
+# cardinal offsets come first, so column k means the same direction in both
+OFFSETS = {
+    4: CARDINAL,
+    8: np.concatenate((CARDINAL, DIAGONAL)),
+}
+
+
+class GridTopology:
+    """
+    Neighbour table for a grid shape
+
+    Use topology(shape) rather than constructing this directly, so the table is
+    only built once per shape
+
+    Args:
+        shape (tuple):
+            (rows, cols) of the grid
+        connectivity (int):
+            4 for cardinal neighbours, 8 to include the diagonals
+        wrap (bool):
+            treat the grid as a torus, so edges wrap around to the opposite side
+    """
+
+    __slots__ = ["_shape", "_offsets", "_wrap", "_neighbours"]
+
+    def __init__(self, shape: tuple[int, int], connectivity: int = 4, wrap: bool = False):
+        if connectivity not in OFFSETS:
+            raise ValueError(f"connectivity must be one of {list(OFFSETS)}, not {connectivity}")
+
+        self._shape = (int(shape[0]), int(shape[1]))
+        self._offsets = OFFSETS[connectivity]
+        self._wrap = wrap
+
+        self._neighbours = self._build(self._offsets)
+
+    def __repr__(self) -> str:
+        return f"GridTopology({self._shape}, connectivity={self.connectivity}, wrap={self._wrap})"
+
+    def _build(self, offsets: np.ndarray) -> np.ndarray:
+        """Build the (cells, len(offsets)) neighbour table"""
+        imax, jmax = self._shape
+        # int32 halves the table size, which matters for very large grids
+        dtype = np.int32 if imax * jmax < 2 ** 31 else np.int64
+        index = np.arange(imax * jmax, dtype=dtype).reshape(self._shape)
+
+        table = np.full((imax, jmax, len(offsets)), OFF_GRID, dtype=dtype)
+        for col, (di, dj) in enumerate(offsets.tolist()):
+            if self._wrap:
+                # every cell has a neighbour, rolling brings (i + di, j + dj) mod shape to (i, j)
+                table[:, :, col] = np.roll(index, (-di, -dj), axis=(0, 1))
+                continue
+            # cells whose neighbour at (i + di, j + dj) is still on the grid
+            i0, i1 = max(0, -di), imax - max(0, di)
+            j0, j1 = max(0, -dj), jmax - max(0, dj)
+            if i0 < i1 and j0 < j1:
+                table[i0:i1, j0:j1, col] = index[i0 + di:i1 + di, j0 + dj:j1 + dj]
+
+        table = table.reshape(imax * jmax, len(offsets))
+        table.flags.writeable = False
+        return table
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self._shape
+
+    @property
+    def size(self) -> int:
+        return self._shape[0] * self._shape[1]
+
+    @property
+    def offsets(self) -> np.ndarray:
+        """(k, 2) array of (di, dj) offsets, one per neighbour table column"""
+        return self._offsets
+
+    @property
+    def connectivity(self) -> int:
+        return len(self._offsets)
+
+    @property
+    def wrap(self) -> bool:
+        return self._wrap
+
+    @property
+    def neighbours(self) -> np.ndarray:
+        """
+        (cells, k) table of neighbour flat indices, OFF_GRID where there is none
+
+        Columns follow offsets: -i, -j, +i, +j, then the diagonals for 8 connectivity
+        """
+        return self._neighbours
+
+    def adjacent(self, cell: int) -> list[int]:
+        """
+        Flat indices of the valid neighbours of one cell
+
+        Read from the table on each call, rather than keeping a python list per
+        cell, which would cost far more memory than the table itself
+        """
+        return [n for n in self._neighbours[cell].tolist() if n != OFF_GRID]
+
+    def ravel(self, points: np.ndarray) -> np.ndarray:
+        """Convert an (N, 2) array of points to flat indices"""
+        points = np.asarray(points, dtype=np.intp).reshape(-1, 2)
+        return points[:, 0] * self._shape[1] + points[:, 1]
+
+    def unravel(self, indices: np.ndarray) -> np.ndarray:
+        """Convert flat indices to an (N, 2) array of points"""
+        return np.column_stack(np.divmod(np.asarray(indices, dtype=np.intp), self._shape[1]))
+
+
+def move(points: np.ndarray, velocity: np.ndarray, steps: int = 1, wrap: tuple[int, int] | None = None) -> np.ndarray:
+    """
+    Advance (N, 2) points by steps * velocity in one go
+
+    Needs no neighbour table, so it works for any grid size
+
+    Args:
+        points (np.ndarray):
+            (N, 2) starting points
+        velocity (np.ndarray):
+            (N, 2) or (2,) offset per step
+        steps (int):
+            number of steps to take
+        wrap (tuple):
+            (rows, cols) of a torus to bring the points back onto,
+            otherwise points may land off the grid
+
+    Returns:
+        np.ndarray: (N, 2) final points
+    """
+    moved = np.asarray(points, dtype=np.int64) + steps * np.asarray(velocity, dtype=np.int64)
+    if wrap is not None:
+        moved = np.mod(moved, wrap)
+    return moved
+
+
+# grids with more cells than this get a fresh table on every call, rather than
+# one pinned in the cache for the life of the process (a 4000x4000 table is 244MiB)
+CACHE_CELLS = 1 << 20
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_topology(shape: tuple[int, int], connectivity: int, wrap: bool) -> GridTopology:
+    return GridTopology(shape, connectivity=connectivity, wrap=wrap)
+
+
+def topology(shape: tuple[int, int], connectivity: int = 4, wrap: bool = False) -> GridTopology:
+    """
+    GridTopology for a shape, cached unless the grid is large
+
+    Callers working on large grids should hold on to the result for as long as
+    they need it, as BFS does
+
+    Args:
+        shape (tuple):
+            (rows, cols) of the grid
+        connectivity (int):
+            4 for cardinal neighbours, 8 to include the diagonals
+        wrap (bool):
+            treat the grid as a torus
+    """
+    shape = (int(shape[0]), int(shape[1]))
+    if shape[0] * shape[1] > CACHE_CELLS:
+        return GridTopology(shape, connectivity=connectivity, wrap=wrap)
+    return _cached_topology(shape, connectivity, wrap)
@@ -0,0 +1,123 @@
+import contextlib
+import functools
+import time
+
+# peak memory of the running phases, innermost last
+# nested phases reset the tracemalloc peak, so they hand their peak back up this stack
+_peak_stack = []
+
+
+class PhaseRecorder:
+    """
+    Records wall time, call counts and (optionally) peak traced memory per named phase
+
+    Args:
+        memory (bool):
+            track peak memory with tracemalloc. This is expensive, so it's off by default
+    """
+
+    __slots__ = ["_phases", "memory"]
+
+    def __init__(self, memory: bool = False):
+        self._phases = {}
+        self.memory = memory
+
+    @property
+    def phases(self) -> dict:
+        return self._phases
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """
+        Context manager recording a single call of phase `name`
+
+        Args:
+            name (str):
+                phase name, repeated calls are accumulated
+        """
+        if self.memory:
+            # deferred, tracemalloc pulls in linecache and tokenize
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            _, peak = tracemalloc.get_traced_memory()
+            if _peak_stack:
+                _peak_stack[-1] = max(_peak_stack[-1], peak)
+            tracemalloc.reset_peak()
+            _peak_stack.append(0)
+
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            dt = time.perf_counter() - t0
+
+            peak = None
+            if self.memory:
+                import tracemalloc
+
+                _, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, _peak_stack.pop())
+                if _peak_stack:
+                    _peak_stack[-1] = max(_peak_stack[-1], peak)
+
+            self.record(name, dt, peak)
+
+    def record(self, name: str, dt: float, peak: int | None = None) -> None:
+        """Add a single call to the phase `name`"""
+        try:
+            entry = self._phases[name]
+        except KeyError:
+            entry = {"calls": 0, "time": 0.0, "peak": None}
+            self._phases[name] = entry
+
+        entry["calls"] += 1
+        entry["time"] += dt
+        if peak is not None:
+            entry["peak"] = max(entry["peak"] or 0, peak)
+
+    def to_json(self, **kwargs) -> str:
+        """Export the recorded phases as a json string, kwargs are passed to json.dumps"""
+        import json
+
+        return json.dumps({"phases": self._phases}, **kwargs)
+
+    def dump(self, path: str) -> None:
+        """Write the recorded phases to a json file"""
+        with open(path, "w+", encoding="utf8") as o:
+            o.write(self.to_json(indent=2))
+
+    def summary(self) -> str:
+        """Human readable table of phases"""
+        output = []
+        for name, entry in self._phases.items():
+            line = f"step: {name}, {entry['time']:.2f}s ({entry['calls']} calls)"
+            if entry["peak"] is not None:
+                line += f", peak {entry['peak'] / 1024 ** 2:.1f}MiB"
+            output.append(line)
+        return "\n".join(output)
+
+
+def timed(name: str | None = None):
+    """
+    Decorator recording a solver method as a phase
+
+    The instance must provide a `phase` context manager, as BaseSolver does
+
+    Args:
+        name (str):
+            phase name, defaults to the qualified function name
+    """
+    def decorator(func):
+        phase_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.phase(phase_name):
+                return func(self, *args, **kwargs)
+
+        wrapper.__timed__ = True
+        return wrapper
+
+    return decorator
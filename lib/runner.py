@@ -0,0 +1,99 @@
+"""
+Run every day and part concurrently in a process pool
+
+Tasks are scheduled longest first, using the medians recorded by lib.benchmark,
+and results are printed as each one finishes. Run from the repository root:
+
+    python -m lib.runner --inputs real --workers 8
+"""
+import argparse
+import concurrent.futures
+import os
+import sys
+import time
+
+from lib import benchmark
+
+
+def schedule(tasks: list[tuple[str, str, str]], baseline: dict) -> list[tuple[str, str, str]]:
+    """
+    Order tasks longest first
+
+    Tasks without a recorded timing are assumed to be slow, and go to the front
+
+    Args:
+        tasks (list):
+            [(day, part, kind), ...]
+        baseline (dict):
+            benchmark baseline, {key: {"median": ...}}
+    """
+    def expected(task) -> float:
+        try:
+            return baseline[benchmark.key(*task)]["median"]
+        except KeyError:
+            return float("inf")
+
+    return sorted(tasks, key=expected, reverse=True)
+
+
+def execute(day: str, part: str, kind: str) -> tuple[str, object, float, str | None]:
+    """
+    Worker entry point, runs one task
+
+    Returns:
+        tuple: (key, answer, duration in seconds, error message or None)
+    """
+    t0 = time.perf_counter()
+    try:
+        answer = benchmark.run_task(day, part, kind)
+        error = None
+    except Exception as ex:
+        answer = None
+        error = f"{type(ex).__name__}: {ex}"
+    return benchmark.key(day, part, kind), answer, time.perf_counter() - t0, error
+
+
+def run_all(tasks: list[tuple[str, str, str]], workers: int | None = None):
+    """
+    Generator running tasks in a process pool, yielding results as they complete
+
+    Args:
+        tasks (list):
+            [(day, part, kind), ...], submitted in order
+        workers (int):
+            pool size, defaults to the cpu count
+    """
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(execute, *task) for task in tasks]
+        for future in concurrent.futures.as_completed(futures):
+            yield future.result()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the daily solutions in parallel")
+    parser.add_argument("days", nargs="*", help="days to run, e.g. Day01 (default: all)")
+    parser.add_argument("--inputs", nargs="+", choices=list(benchmark.INPUTS), default=["real"])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--baseline", default=benchmark.BASELINE)
+    args = parser.parse_args(argv)
+
+    tasks = schedule(
+        benchmark.tasks(benchmark.discover(args.days), args.inputs),
+        benchmark.load_baseline(args.baseline),
+    )
+
+    failed = 0
+    t0 = time.perf_counter()
+    for name, answer, dt, error in run_all(tasks, workers=args.workers):
+        if error is not None:
+            failed += 1
+            print(f"{name:<22} FAILED {dt:.3f}s  {error}")
+        else:
+            print(f"{name:<22} {dt:.3f}s  -> {answer}")
+    print(f"{len(tasks)} tasks in {time.perf_counter() - t0:.3f}s")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
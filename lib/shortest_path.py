@@ -0,0 +1,278 @@
+"""
+Weighted shortest paths over compact graphs
+
+Graphs are stored in CSR form: the out edges of node u are
+indices[indptr[u]:indptr[u + 1]], with matching weights. Grids are converted
+with grid_graph, where moving into a cell costs that cell's value.
+
+Distances and predecessors are flat arrays indexed by node, never dicts
+"""
+import heapq
+import math
+
+import numpy as np
+
+from lib.grid import OFF_GRID, topology
+
+# predecessor of sources and unreached nodes
+NO_NODE = -1
+
+
+class CSRGraph:
+    """
+    Directed graph in compressed sparse row form
+
+    Use CSRGraph.from_edges rather than building the arrays by hand
+
+    Args:
+        indptr (np.ndarray):
+            (nodes + 1) row offsets into indices
+        indices (np.ndarray):
+            edge targets, sorted within each row
+        weights (np.ndarray):
+            edge weights, matching indices
+    """
+
+    __slots__ = ["_indptr", "_indices", "_weights", "_lists"]
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray):
+        self._indptr = np.asarray(indptr, dtype=np.intp)
+        self._indices = np.asarray(indices, dtype=np.intp)
+        self._weights = np.asarray(weights, dtype=np.float64)
+
+        self._lists = None
+
+    def __repr__(self) -> str:
+        return f"CSRGraph({self.size} nodes, {len(self._indices)} edges)"
+
+    @classmethod
+    def from_edges(cls, src, dst, weights=None, size: int | None = None) -> "CSRGraph":
+        """
+        Build a graph from parallel edge arrays
+
+        Args:
+            src (np.ndarray):
+                edge sources
+            dst (np.ndarray):
+                edge targets
+            weights (np.ndarray):
+                edge weights, defaults to 1 for every edge
+            size (int):
+                node count, defaults to one more than the largest node id
+
+        Returns:
+            CSRGraph
+        """
+        src = np.asarray(src, dtype=np.intp).ravel()
+        dst = np.asarray(dst, dtype=np.intp).ravel()
+        if weights is None:
+            weights = np.ones(len(src), dtype=np.float64)
+        weights = np.broadcast_to(np.asarray(weights, dtype=np.float64), src.shape)
+
+        if size is None:
+            size = int(max(src.max(initial=-1), dst.max(initial=-1))) + 1
+
+        # sort by source, then target, so has_edge can bisect a row
+        order = np.lexsort((dst, src))
+        indptr = np.zeros(size + 1, dtype=np.intp)
+        np.cumsum(np.bincount(src, minlength=size), out=indptr[1:])
+
+        return cls(indptr, dst[order], weights[order])
+
+    @property
+    def indptr(self) -> np.ndarray:
+        return self._indptr
+
+    @property
+    def indices(self) -> np.ndarray:
+        return self._indices
+
+    @property
+    def weights(self) -> np.ndarray:
+        return self._weights
+
+    @property
+    def size(self) -> int:
+        return len(self._indptr) - 1
+
+    @property
+    def lists(self) -> tuple[list[int], list[int], list[float]]:
+        """
+        (indptr, indices, weights) as python lists
+
+        For searches that run in python, where indexing a list beats indexing an array
+        """
+        if self._lists is None:
+            self._lists = (self._indptr.tolist(), self._indices.tolist(), self._weights.tolist())
+        return self._lists
+
+    def successors(self, node: int) -> np.ndarray:
+        return self._indices[self._indptr[node]:self._indptr[node + 1]]
+
+    def has_edge(self, u: int, v: int) -> bool:
+        """True if there is a direct edge u -> v"""
+        if not 0 <= u < self.size:
+            return False
+        row = self.successors(u)
+        idx = np.searchsorted(row, v)
+        return bool(idx < len(row) and row[idx] == v)
+
+
+def grid_graph(cost: np.ndarray, connectivity: int = 4, wrap: bool = False) -> CSRGraph:
+    """
+    Graph of moves on a grid, where entering a cell costs its value
+
+    Cells with a non-finite cost (e.g. np.inf for walls) cannot be entered
+
+    Args:
+        cost (np.ndarray):
+            2D array of cell costs
+        connectivity (int):
+            4 for cardinal moves, 8 to include the diagonals
+        wrap (bool):
+            treat the grid as a torus
+
+    Returns:
+        CSRGraph: nodes are flat cell indices, as for GridTopology
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    neighbours = topology(cost.shape, connectivity=connectivity, wrap=wrap).neighbours
+
+    dst = neighbours.ravel()
+    src = np.repeat(np.arange(neighbours.shape[0], dtype=np.intp), neighbours.shape[1])
+
+    keep = dst != OFF_GRID
+    src = src[keep]
+    dst = dst[keep]
+
+    weights = cost.ravel()[dst]
+    keep = np.isfinite(weights)
+
+    return CSRGraph.from_edges(src[keep], dst[keep], weights[keep], size=cost.size)
+
+
+def manhattan(shape: tuple[int, int], target: tuple[int, int], scale: float = 1.0) -> np.ndarray:
+    """
+    Flat A* heuristic for grid_graph, the manhattan distance to target
+
+    Args:
+        shape (tuple):
+            (rows, cols) of the grid
+        target (tuple):
+            goal point
+        scale (float):
+            cheapest cell cost, keeps the heuristic admissible
+
+    Returns:
+        np.ndarray: heuristic value per flat cell index
+    """
+    i, j = np.indices(shape)
+    return (scale * (np.abs(i - target[0]) + np.abs(j - target[1]))).ravel()
+
+
+def dijkstra(
+        graph: CSRGraph,
+        sources,
+        target: int | None = None,
+        heuristic=None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Heap based shortest paths from one or more sources
+
+    With a target the search stops as soon as the target is settled, so only
+    nodes closer than the target are guaranteed final. Weights must not be negative.
+
+    Args:
+        graph (CSRGraph):
+            graph to search
+        sources (int, list):
+            node or nodes to start from
+        target (int):
+            optional node to stop at
+        heuristic (np.ndarray):
+            optional per node lower bound on the remaining distance to target,
+            turning the search into A*. It must be consistent
+
+    Returns:
+        tuple: (distance, predecessor) arrays indexed by node,
+            distance is inf and predecessor NO_NODE where unreached
+    """
+    indptr, indices, weights = graph.lists
+    size = graph.size
+
+    distance = [math.inf] * size
+    predecessor = [NO_NODE] * size
+    settled = bytearray(size)
+
+    estimate = None
+    if heuristic is not None:
+        estimate = np.asarray(heuristic, dtype=np.float64).tolist()
+
+    heap = []
+    for source in np.atleast_1d(sources).tolist():
+        distance[source] = 0.0
+        heap.append((estimate[source] if estimate else 0.0, source))
+    heapq.heapify(heap)
+
+    while heap:
+        _, u = heapq.heappop(heap)
+        if settled[u]:
+            continue
+        settled[u] = 1
+        if u == target:
+            break
+
+        base = distance[u]
+        for e in range(indptr[u], indptr[u + 1]):
+            v = indices[e]
+            if settled[v]:
+                continue
+            d = base + weights[e]
+            if d < distance[v]:
+                distance[v] = d
+                predecessor[v] = u
+                heapq.heappush(heap, (d + estimate[v] if estimate else d, v))
+
+    return np.array(distance, dtype=np.float64), np.array(predecessor, dtype=np.intp)
+
+
+def astar(graph: CSRGraph, source: int, target: int, heuristic) -> tuple[np.ndarray, np.ndarray]:
+    """
+    A* search from source to target, see dijkstra
+
+    Args:
+        graph (CSRGraph):
+            graph to search
+        source (int):
+            node to start from
+        target (int):
+            node to stop at
+        heuristic (np.ndarray):
+            per node consistent lower bound on the distance to target, e.g. manhattan()
+    """
+    return dijkstra(graph, source, target=target, heuristic=heuristic)
+
+
+def path(distance: np.ndarray, predecessor: np.ndarray, target: int) -> list[int]:
+    """
+    Walk a predecessor array back from target
+
+    Args:
+        distance (np.ndarray):
+            distances from dijkstra
+        predecessor (np.ndarray):
+            predecessors from dijkstra
+        target (int):
+            node to walk back from
+
+    Returns:
+        list: nodes from the source to target, empty if target was not reached
+    """
+    if not np.isfinite(distance[target]):
+        return []
+
+    predecessor = predecessor.tolist()
+    output = [target]
+    while predecessor[output[-1]] != NO_NODE:
+        output.append(predecessor[output[-1]])
+    return output[::-1]
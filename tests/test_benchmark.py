@@ -0,0 +1,29 @@
+import unittest
+
+from lib import benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_discover(self):
+        days = benchmark.discover()
+        assert "Day01" in days
+        assert days == sorted(days)
+
+    def test_discover_filter(self):
+        assert benchmark.discover(["Day02"]) == ["Day02"]
+
+    def test_summarise(self):
+        stats = benchmark.summarise([float(i) for i in range(1, 21)])
+        assert stats["min"] == 1.0
+        assert stats["median"] == 10.5
+        assert stats["p95"] == 19.0
+
+    def test_regressions(self):
+        baseline = {"a": {"median": 1.0}, "b": {"median": 1.0}}
+        results = {"a": {"median": 1.05}, "b": {"median": 1.5}, "c": {"median": 9.0}}
+        assert list(benchmark.regressions(results, baseline, threshold=0.1)) == ["b"]
+
+    def test_run_task(self):
+        answer, times = benchmark.time_task("Day01", "part_1", "test", warmup=0, repeat=2)
+        assert answer == 11
+        assert len(times) == 2
@@ -0,0 +1,147 @@
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from lib.base_solver import BaseSolver
+from lib.bfs import BFS
+
+solver = BaseSolver(inp="Input/test.txt")
+
+
+class FloodFill(BFS):
+    def extra_condition(self, node: tuple[int, int], test: tuple[int, int]) -> bool:
+        return self.value(node) == self.value(test)
+
+
+class TestBFS(unittest.TestCase):
+    def test_unconditional(self):
+        result = BFS(solver.array).search((0, 0))
+        assert len(result) == solver.array.size
+        assert result[0] == (0, 0)
+
+    def test_flood_fill(self):
+        result = FloodFill(solver.array).search((1, 8))
+        # the "0" at (1, 8) has no equal neighbours
+        assert result == [(1, 8)]
+
+    def test_flood_fill_background(self):
+        result = FloodFill(solver.array).search((0, 0))
+        assert len(result) == len(solver.points_where("."))
+
+    def test_flat(self):
+        search = BFS(solver.array)
+        flat = search.search_flat((2, 3))
+        assert isinstance(flat, np.ndarray)
+        assert [tuple(p) for p in search.topology.unravel(flat).tolist()] == search.search((2, 3))
+
+    def test_order(self):
+        # breadth first, so distances never decrease
+        result = BFS(solver.array).search((5, 5))
+        distances = [abs(i - 5) + abs(j - 5) for i, j in result]
+        assert distances == sorted(distances)
+
+
+class StepSearch(BFS):
+    def extra_condition(self, node: tuple[int, int], test: tuple[int, int]) -> bool:
+        return abs(int(self.value(node)) - int(self.value(test))) <= 1
+
+    def vector_condition(self, src_values: np.ndarray, dst_values: np.ndarray) -> np.ndarray:
+        return np.abs(src_values.astype(int) - dst_values) <= 1
+
+
+class TestFrontierSearch(unittest.TestCase):
+    array = np.random.default_rng(12).integers(0, 3, size=(30, 40))
+
+    def test_open_grid(self):
+        distance = BFS(np.zeros((5, 7))).frontier_search((0, 0))
+        i, j = np.indices((5, 7))
+        assert (distance == i + j).all()
+
+    def test_reachable_matches_search(self):
+        search = StepSearch(self.array)
+        distance = search.frontier_search((0, 0))
+        reached = {tuple(p) for p in np.argwhere(distance >= 0).tolist()}
+        assert reached == set(search.search((0, 0)))
+
+    def test_predicate_argument(self):
+        distance = BFS(self.array).frontier_search((0, 0), predicate=lambda src, dst: dst == src)
+        region = FloodFill(self.array).search((0, 0))
+        assert (distance >= 0).sum() == len(region)
+
+    def test_multiple_heads(self):
+        distance = BFS(np.zeros((1, 9))).frontier_search(np.array([(0, 0), (0, 8)]))
+        assert distance.tolist() == [[0, 1, 2, 3, 4, 3, 2, 1, 0]]
+
+
+class TestMultiSourceSearch(unittest.TestCase):
+    array = np.random.default_rng(12).integers(0, 3, size=(30, 40))
+
+    def test_labels(self):
+        distance, label = BFS(np.zeros((1, 9))).multi_source_search(np.array([(0, 0), (0, 8)]))
+        assert distance.tolist() == [[0, 1, 2, 3, 4, 3, 2, 1, 0]]
+        # the middle cell is a tie, the first listed source wins
+        assert label.tolist() == [[0, 0, 0, 0, 0, 1, 1, 1, 1]]
+
+    def test_matches_frontier_search(self):
+        search = StepSearch(self.array)
+        sources = np.array([(0, 0), (29, 39), (15, 20)])
+        distance, label = search.multi_source_search(sources)
+        assert (distance == search.frontier_search(sources)).all()
+        assert ((label >= 0) == (distance >= 0)).all()
+
+    def test_nearest_source(self):
+        sources = np.array([(0, 0), (4, 6), (2, 3)])
+        distance, label = BFS(np.zeros((5, 7))).multi_source_search(sources)
+        i, j = np.indices((5, 7))
+        # on an open grid every distance is a manhattan distance
+        manhattan = np.stack([np.abs(i - a) + np.abs(j - b) for a, b in sources])
+        assert (distance == manhattan.min(axis=0)).all()
+        assert (manhattan[label, i, j] == distance).all()
+
+
+class TestBidirectionalSearch(unittest.TestCase):
+    array = np.random.default_rng(12).integers(0, 3, size=(30, 40))
+
+    def test_open_grid(self):
+        search = BFS(np.zeros((20, 30)))
+        assert search.bidirectional_search((2, 3), (15, 27)) == 13 + 24
+        assert search.bidirectional_search((4, 4), (4, 4)) == 0
+
+    def test_matches_frontier_search(self):
+        search = StepSearch(self.array)
+        distance = search.frontier_search((0, 0))
+        for target in [(29, 39), (10, 10), (0, 1), (17, 3)]:
+            assert search.bidirectional_search((0, 0), target) == distance[target]
+
+    def test_directed_condition(self):
+        # uphill by at most one, so the reverse route is not always valid
+        class Climb(BFS):
+            def extra_condition(self, node: tuple[int, int], test: tuple[int, int]) -> bool:
+                return self.value(node) - self.value(test) in (0, 1)
+
+        search = Climb(np.array([[0, 1, 2, 3]]))
+        assert search.bidirectional_search((0, 0), (0, 3)) == 3
+        assert search.bidirectional_search((0, 3), (0, 0)) == -1
+
+    def test_short_query_on_large_grid(self):
+        # the cost of a short query should not depend on the grid size
+        search = BFS(np.zeros((1500, 1500), dtype=np.uint8))
+        tracemalloc.start()
+        try:
+            steps, points = search.bidirectional_search((700, 700), (703, 704), return_path=True)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert steps == 7 and len(points) == 8
+        assert peak < 1024 ** 2, peak
+
+    def test_path(self):
+        search = StepSearch(self.array)
+        steps, points = search.bidirectional_search((0, 0), (29, 39), return_path=True)
+        assert steps == search.frontier_search((0, 0))[29, 39]
+        assert len(points) == steps + 1
+        assert points[0] == (0, 0) and points[-1] == (29, 39)
+        for test, node in zip(points, points[1:]):
+            assert node in search.get_adjacent(test)
+            assert search.extra_condition(node, test)
@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from lib import cache
+
+INPUT = "Input/test.txt"
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.calls = 0
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def builder(self) -> dict:
+        self.calls += 1
+        return {"values": np.arange(10)}
+
+    def test_disabled(self):
+        os.environ.pop("AOC_CACHE_DIR", None)
+        cache.cached_arrays(INPUT, "test", 1, self.builder)
+        cache.cached_arrays(INPUT, "test", 1, self.builder)
+        assert self.calls == 2
+
+    def test_reuse(self):
+        first = cache.cached_arrays(INPUT, "test", 1, self.builder, directory=self.tmp.name)
+        second = cache.cached_arrays(INPUT, "test", 1, self.builder, directory=self.tmp.name)
+        assert self.calls == 1
+        assert (first["values"] == second["values"]).all()
+        assert isinstance(second["values"], np.memmap)
+
+    def test_version(self):
+        cache.cached_arrays(INPUT, "test", 1, self.builder, directory=self.tmp.name)
+        cache.cached_arrays(INPUT, "test", 2, self.builder, directory=self.tmp.name)
+        assert self.calls == 2
@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 from lib.base_solver import BaseSolver
 
 solver = BaseSolver(inp="Input/test.txt")
@@ -15,3 +17,19 @@ class TestBounds(unittest.TestCase):
 
     def test_larger_negative(self):
         assert not solver.check_inside_bounds((-5, -5))
+
+
+class TestBoundsBatch(unittest.TestCase):
+    def test_matches_single(self):
+        points = [(5, 5), (0, 0), (-1, -1), (-5, -5), (11, 11), (12, 0), (0, 12), (-1, 3)]
+        mask = solver.check_inside_bounds_batch(np.array(points))
+        assert mask.tolist() == [solver.check_inside_bounds(point) for point in points]
+
+    def test_adjacent(self):
+        adj = solver.get_adjacent_batch(np.array([(5, 5), (0, 0)]))
+        assert adj.shape == (2, 4, 2)
+        assert [tuple(p) for p in adj[0].tolist()] == [(4, 5), (5, 4), (6, 5), (5, 6)]
+
+    def test_adjacent_filtered(self):
+        adj = solver.get_adjacent_batch(np.array([(0, 0)])).reshape(-1, 2)
+        assert solver.check_inside_bounds_batch(adj).tolist() == [False, False, True, True]
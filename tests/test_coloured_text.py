@@ -0,0 +1,26 @@
+import io
+import unittest
+
+from lib.base_solver import BaseSolver, COLOUR_CODES, COLOUR_RESET
+
+solver = BaseSolver(inp="Input/test.txt")
+class TestColouredText(unittest.TestCase):
+    def test_uncoloured(self):
+        assert solver.regenerate_coloured_text(solver.array) == solver.regenerate_text(solver.array)
+
+    def test_empty_colours(self):
+        assert solver.regenerate_coloured_text(solver.array, colours={}) == solver.regenerate_text(solver.array)
+
+    def test_colour_applied(self):
+        text = solver.regenerate_coloured_text(solver.array, colours={"red": [(1, 8)]})
+        assert text.split("\n")[1].split(" ")[8] == f"{COLOUR_CODES['red']}0{COLOUR_RESET}"
+
+    def test_first_colour_wins(self):
+        text = solver.regenerate_coloured_text(solver.array, colours={"blue": [(0, 0)], "red": [(0, 0)]})
+        assert text.startswith(COLOUR_CODES["blue"])
+
+    def test_stream(self):
+        colours = {"green": [(5, 6)]}
+        stream = io.StringIO()
+        solver.write_coloured_text(stream, solver.array, colours=colours)
+        assert stream.getvalue() == solver.regenerate_coloured_text(solver.array, colours=colours) + "\n"
@@ -0,0 +1,59 @@
+import unittest
+
+import numpy as np
+
+from lib.bfs import BFS
+from lib.components import label_components
+
+
+class FloodFill(BFS):
+    def extra_condition(self, node: tuple[int, int], test: tuple[int, int]) -> bool:
+        return self.value(node) == self.value(test)
+
+
+class TestComponents(unittest.TestCase):
+    def test_small(self):
+        array = np.array([
+            [1, 1, 2],
+            [3, 1, 2],
+            [3, 3, 1],
+        ])
+        labels, sizes = label_components(array)
+        # numbered in raster order of each region's first cell
+        assert labels.tolist() == [
+            [0, 0, 1],
+            [2, 0, 1],
+            [2, 2, 3],
+        ]
+        assert sizes.tolist() == [3, 2, 3, 1]
+
+    def test_diagonal_not_connected(self):
+        labels, sizes = label_components(np.eye(3, dtype=int))
+        assert len(sizes) == 5
+
+    def test_spiral(self):
+        # a single snaking region needs several merge rounds
+        array = np.zeros((7, 7), dtype=int)
+        array[1::2, :-1] = 1
+        array[1::4, -1] = 0
+        labels, sizes = label_components(array)
+        assert sizes.sum() == array.size
+        assert len(np.unique(labels[array == 0])) == 1
+
+    def test_matches_flood_fill(self):
+        rng = np.random.default_rng(12)
+        array = rng.integers(0, 3, (15, 11))
+        labels, sizes = label_components(array)
+
+        search = FloodFill(array)
+        for label, size in enumerate(sizes):
+            start = tuple(int(x) for x in np.argwhere(labels == label)[0])
+            region = search.search(start)
+            assert len(region) == size
+            assert all(labels[point] == label for point in region)
+
+    def test_diagonal_connectivity(self):
+        labels, sizes = label_components(np.eye(3, dtype=int), connectivity=8)
+        # both the diagonal and the zeros either side of it connect up
+        assert sizes.tolist() == [3, 6]
+        assert (labels == 1 - np.eye(3, dtype=int)).all()
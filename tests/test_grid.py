@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from lib.base_solver import BaseSolver
+
+solver = BaseSolver(inp="Input/test.txt")
+class TestGrid(unittest.TestCase):
+    def test_shape(self):
+        assert solver.grid.shape == solver.array.shape
+
+    def test_dtype(self):
+        assert solver.grid.dtype == np.uint8
+
+    def test_matches_array(self):
+        assert (solver.grid.view("S1").astype(str) == solver.array).all()
+
+    def test_points_where(self):
+        points = [tuple(int(p) for p in point) for point in solver.grid_points_where("A")]
+        assert points == solver.points_where("A")
+
+
+class TestRagged(unittest.TestCase):
+    def grid_of(self, text: bytes) -> np.ndarray:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "grid.txt")
+            with open(path, "wb") as o:
+                o.write(text)
+            return BaseSolver(inp=path).grid.copy()
+
+    def test_trailing_newline_optional(self):
+        assert self.grid_of(b"ab\ncd\n").tolist() == self.grid_of(b"ab\ncd").tolist()
+
+    def test_crlf_points_where(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "grid.txt")
+            with open(path, "wb") as o:
+                o.write(b"ab#\r\n#cd")
+            crlf = BaseSolver(inp=path)
+            # grid can't step over the \r column, lookups fall back to array
+            assert crlf.shape == (2, 3)
+            assert crlf.points_where("#") == [(0, 2), (1, 0)]
+            for symbol in "abcd#":
+                x, y = np.where(crlf.array == symbol)
+                assert crlf.points_where(symbol) == list(zip(x.tolist(), y.tolist()))
+
+    def test_ragged(self):
+        for text in (b"abc\nde\nfgh\n", b"abcd\nab\nc\n", b"ab\ncd\n\n", b"ab\r\ncd\r\n"):
+            with self.assertRaises(ValueError):
+                self.grid_of(text)
+
+
+class TestSymbolIndex(unittest.TestCase):
+    def test_symbols(self):
+        assert sorted(solver.symbol_index) == [".", "0", "A"]
+
+    def test_matches_where(self):
+        for symbol in solver.symbol_index:
+            x, y = np.where(solver.array == symbol)
+            assert solver.symbol_points(symbol).tolist() == np.column_stack((x, y)).tolist()
+
+    def test_missing(self):
+        assert solver.symbol_points("#").shape == (0, 2)
+        assert solver.points_where("#") == []
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# seconds allowed for importing the lib modules, on top of numpy itself
+BUDGET = 0.1
+
+# wall clock checks are flaky on loaded machines, so they only run when asked for
+TIMING = os.environ.get("AOC_TIMING_TESTS", "0") != "0"
+
+SCRIPT = """
+import sys
+import time
+
+import numpy
+
+t0 = time.perf_counter()
+import lib.base_solver, lib.bfs, lib.cache, lib.perf
+import Day05.solution, Day12.solution
+print(time.perf_counter() - t0)
+print(",".join(sorted(name for name in ("networkx", "Day10.solution") if name in sys.modules)))
+"""
+
+
+def run_script() -> tuple[float, list[str]]:
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    lines = result.stdout.split("\n")
+    return float(lines[0]), [name for name in lines[1].split(",") if name]
+
+
+class TestImports(unittest.TestCase):
+    def test_no_heavy_imports(self):
+        _, loaded = run_script()
+        assert loaded == [], loaded
+
+    @unittest.skipUnless(TIMING, "set AOC_TIMING_TESTS=1 to check the import time budget")
+    def test_budget(self):
+        # best of a few runs, to ride out a cold disk cache
+        dt = min(run_script()[0] for _ in range(3))
+        assert dt < BUDGET, f"lib imports took {dt:.3f}s"
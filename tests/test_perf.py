@@ -0,0 +1,50 @@
+import json
+import tracemalloc
+import unittest
+
+from lib.base_solver import BaseSolver
+from lib.perf import PhaseRecorder
+
+
+class CountingSolver(BaseSolver, profile=True):
+    def run(self) -> int:
+        return len(self.rows)
+
+
+class PlainSolver(BaseSolver, profile=False):
+    def run(self) -> int:
+        return len(self.rows)
+
+
+solver = CountingSolver(inp="Input/test.txt")
+class TestPerf(unittest.TestCase):
+    def test_not_instrumented(self):
+        plain = PlainSolver(inp="Input/test.txt")
+        plain.run()
+        assert not getattr(PlainSolver.run, "__timed__", False)
+        assert "PlainSolver.run" not in plain.perf.phases
+        # explicit phases are still recorded
+        assert "read" in plain.perf.phases
+
+    def test_auto_instrumented(self):
+        solver.run()
+        solver.run()
+        phases = solver.perf.phases
+        assert phases["CountingSolver.run"]["calls"] >= 2
+        assert "read" in phases
+        assert "parse:rows" in phases
+
+    def test_json(self):
+        solver.run()
+        data = json.loads(solver.perf_json())
+        assert data["phases"]["CountingSolver.run"]["time"] >= 0
+
+    def test_memory(self):
+        recorder = PhaseRecorder(memory=True)
+        with recorder.phase("outer"):
+            with recorder.phase("inner"):
+                block = bytearray(1024 ** 2)
+            del block
+        assert recorder.phases["inner"]["peak"] >= 1024 ** 2
+        assert recorder.phases["outer"]["peak"] >= recorder.phases["inner"]["peak"]
+        tracemalloc.stop()
@@ -0,0 +1,24 @@
+import unittest
+
+from lib.base_solver import BaseSolver
+
+solver = BaseSolver(inp="Input/test.txt")
+class TestRows(unittest.TestCase):
+    def test_rows(self):
+        assert solver.rows == solver.data.split("\n")
+
+    def test_cached(self):
+        assert solver.rows is solver.rows
+
+    def test_line(self):
+        for k, row in enumerate(solver.data.split("\n")):
+            assert solver.line(k) == row
+
+    def test_negative_line(self):
+        assert solver.line(-1) == solver.data.split("\n")[-1]
+
+    def test_iter_rows(self):
+        assert list(solver.iter_rows()) == solver.data.split("\n")
+
+    def test_nlines(self):
+        assert solver.nlines == len(solver.data.split("\n"))
@@ -0,0 +1,25 @@
+import unittest
+
+from lib import runner
+
+
+class TestRunner(unittest.TestCase):
+    def test_schedule(self):
+        tasks = [("Day01", "part_1", "test"), ("Day02", "part_1", "test"), ("Day03", "part_1", "test")]
+        baseline = {
+            "Day01/part_1/test": {"median": 0.1},
+            "Day02/part_1/test": {"median": 2.0},
+        }
+        ordered = runner.schedule(tasks, baseline)
+        # unknown timings are assumed slowest
+        assert [task[0] for task in ordered] == ["Day03", "Day02", "Day01"]
+
+    def test_run_all(self):
+        tasks = [("Day01", "part_1", "test"), ("Day01", "part_2", "test")]
+        results = {name: answer for name, answer, _, _ in runner.run_all(tasks, workers=2)}
+        assert results == {"Day01/part_1/test": 11, "Day01/part_2/test": 31}
+
+    def test_error(self):
+        name, answer, _, error = runner.execute("Day01", "part_3", "test")
+        assert answer is None
+        assert error.startswith("KeyError")
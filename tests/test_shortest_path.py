@@ -0,0 +1,76 @@
+import unittest
+
+import numpy as np
+
+from lib.shortest_path import CSRGraph, astar, dijkstra, grid_graph, manhattan, path
+
+
+class TestCSRGraph(unittest.TestCase):
+    graph = CSRGraph.from_edges([0, 2, 0, 1], [2, 3, 1, 3], [4.0, 1.0, 1.0, 5.0])
+
+    def test_rows(self):
+        assert self.graph.size == 4
+        assert self.graph.indptr.tolist() == [0, 2, 3, 4, 4]
+        # targets are sorted within each row
+        assert self.graph.successors(0).tolist() == [1, 2]
+
+    def test_has_edge(self):
+        assert self.graph.has_edge(0, 2)
+        assert not self.graph.has_edge(2, 0)
+        assert not self.graph.has_edge(3, 0)
+        assert not self.graph.has_edge(7, 0)
+
+    def test_dijkstra(self):
+        distance, predecessor = dijkstra(self.graph, 0)
+        assert distance.tolist() == [0, 1, 4, 5]
+        # 0 -> 2 -> 3 ties with 0 -> 1 -> 3, whichever was relaxed first is kept
+        assert path(distance, predecessor, 3) in ([0, 2, 3], [0, 1, 3])
+        assert path(distance, predecessor, 0) == [0]
+
+    def test_unreachable(self):
+        distance, predecessor = dijkstra(self.graph, 3)
+        assert np.isinf(distance[0])
+        assert path(distance, predecessor, 0) == []
+
+
+class TestGridGraph(unittest.TestCase):
+    cost = np.random.default_rng(3).integers(1, 9, size=(12, 15)).astype(float)
+
+    def test_open_grid(self):
+        distance, _ = dijkstra(grid_graph(np.ones((4, 5))), 0)
+        i, j = np.indices((4, 5))
+        assert (distance.reshape(4, 5) == i + j).all()
+
+    def test_diagonal(self):
+        distance, _ = dijkstra(grid_graph(np.ones((4, 5)), connectivity=8), 0)
+        i, j = np.indices((4, 5))
+        assert (distance.reshape(4, 5) == np.maximum(i, j)).all()
+
+    def test_wrap(self):
+        distance, _ = dijkstra(grid_graph(np.ones((1, 9)), wrap=True), 0)
+        assert distance.tolist() == [0, 1, 2, 3, 4, 4, 3, 2, 1]
+
+    def test_walls(self):
+        cost = np.ones((3, 3))
+        cost[:, 1] = np.inf
+        distance, _ = dijkstra(grid_graph(cost), 0)
+        assert np.isinf(distance.reshape(3, 3)[:, 1:]).all()
+
+    def test_early_termination(self):
+        graph = grid_graph(self.cost)
+        full, _ = dijkstra(graph, 0)
+        partial, _ = dijkstra(graph, 0, target=20)
+        assert partial[20] == full[20]
+        assert np.isinf(partial).sum() > 0
+
+    def test_astar(self):
+        graph = grid_graph(self.cost)
+        target = graph.size - 1
+        full, _ = dijkstra(graph, 0)
+        distance, predecessor = astar(graph, 0, target, manhattan(self.cost.shape, (11, 14)))
+        assert distance[target] == full[target]
+
+        route = path(distance, predecessor, target)
+        assert route[0] == 0 and route[-1] == target
+        # entering each cell on the route costs its value
+        assert self.cost.ravel()[route[1:]].sum() == distance[target]
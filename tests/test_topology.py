@@ -0,0 +1,77 @@
+import unittest
+
+import numpy as np
+
+from lib.bfs import BFS
+from lib.grid import CACHE_CELLS, OFF_GRID, move, topology
+
+
+class TestTopology(unittest.TestCase):
+    def test_cached(self):
+        assert topology((3, 4)) is topology((3, 4))
+
+    def test_large_not_cached(self):
+        # big tables are not pinned for the life of the process
+        shape = (CACHE_CELLS // 1000 + 1, 1000)
+        assert topology(shape) is not topology(shape)
+
+    def test_corner(self):
+        # -i, -j, +i, +j of the top left cell
+        assert topology((3, 4)).neighbours[0].tolist() == [OFF_GRID, OFF_GRID, 4, 1]
+
+    def test_centre(self):
+        assert topology((3, 4)).neighbours[5].tolist() == [1, 4, 9, 6]
+
+    def test_lists(self):
+        assert topology((3, 4)).adjacent(11) == [7, 10]
+
+    def test_ravel(self):
+        topo = topology((3, 4))
+        points = np.array([(0, 0), (1, 2), (2, 3)])
+        assert topo.ravel(points).tolist() == [0, 6, 11]
+        assert topo.unravel(topo.ravel(points)).tolist() == points.tolist()
+
+    def test_bfs_adjacent(self):
+        search = BFS(np.zeros((3, 4)))
+        assert search.get_adjacent((0, 0)) == [(1, 0), (0, 1)]
+        assert search.get_adjacent((0, 0), ignore_bounds=True) == [(-1, 0), (0, -1), (1, 0), (0, 1)]
+
+
+class TestConnectivity(unittest.TestCase):
+    def test_diagonal(self):
+        topo = topology((3, 4), connectivity=8)
+        assert topo.connectivity == 8
+        # cardinal columns are unchanged, then -i-j, -i+j, +i-j, +i+j
+        assert topo.neighbours[5].tolist() == [1, 4, 9, 6, 0, 2, 8, 10]
+        assert topo.adjacent(0) == [4, 1, 5]
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            topology((3, 4), connectivity=6)
+
+    def test_wrap(self):
+        topo = topology((3, 4), wrap=True)
+        assert topo.neighbours[0].tolist() == [8, 3, 4, 1]
+        assert (topo.neighbours != OFF_GRID).all()
+
+    def test_wrap_diagonal(self):
+        topo = topology((3, 4), connectivity=8, wrap=True)
+        assert topo.neighbours[11].tolist() == [7, 10, 3, 8, 6, 4, 2, 0]
+
+    def test_move(self):
+        points = np.array([(2, 4), (0, 0)])
+        velocity = np.array([(2, -3), (-1, 1)])
+        assert move(points, velocity, steps=5, wrap=(7, 11)).tolist() == [[5, 0], [2, 5]]
+        assert move(points, velocity, steps=5).tolist() == [[12, -11], [-5, 5]]
+
+    def test_bfs_diagonal(self):
+        search = BFS(np.zeros((3, 4)), connectivity=8)
+        assert search.get_adjacent((0, 0)) == [(1, 0), (0, 1), (1, 1)]
+        assert len(search.get_adjacent((0, 0), ignore_bounds=True)) == 8
+        assert len(search.search((0, 0))) == 12
+
+    def test_bfs_wrap(self):
+        search = BFS(np.zeros((3, 4)), wrap=True)
+        assert search.get_adjacent((0, 0)) == [(2, 0), (0, 3), (1, 0), (0, 1)]
+        distance = search.frontier_search((0, 0))
+        assert distance[2, 3] == 2
@@ -0,0 +1,31 @@
+import contextlib
+import io
+import unittest
+
+from lib.base_solver import BaseSolver, DEBUG, INFO
+
+solver = BaseSolver(inp="Input/test.txt")
+class TestTrace(unittest.TestCase):
+    def capture(self, verbosity, *args, **kwargs) -> str:
+        solver.verbosity = verbosity
+        stream = io.StringIO()
+        with contextlib.redirect_stdout(stream):
+            solver.trace(*args, **kwargs)
+        return stream.getvalue()
+
+    def test_disabled(self):
+        assert self.capture(0, INFO, "message") == ""
+
+    def test_level_filter(self):
+        assert self.capture(INFO, DEBUG, "message") == ""
+        assert self.capture(DEBUG, DEBUG, "message") == "message\n"
+
+    def test_format(self):
+        assert self.capture(INFO, INFO, "{} of {}", 1, 2, end="") == "1 of 2"
+
+    def test_lazy(self):
+        def fail():
+            raise AssertionError("formatted while disabled")
+
+        assert self.capture(0, DEBUG, fail) == ""
+        assert self.capture(DEBUG, DEBUG, lambda: "rendered") == "rendered\n"